@@ -17,23 +17,29 @@ import pandas as pd
 import time
 from pathlib import Path
 import shutil
+import tempfile
 import json
+import re
+import copy
+import hashlib
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+
+# orjson is a faster drop-in for parsing LLM output; fall back to stdlib json
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Feature probe for older Streamlit installs, resolved once at import
+_HAS_AUDIO_INPUT = hasattr(st, 'audio_input')
 
 # --- IMPORT CORE MODULES ---
 # Wrap imports in try/except to prevent crash if run from wrong directory
 try:
     from core.resume_parser import ResumeParser
-    from core.resume_analyzer import UltraIntelligentResumeAnalyzer
-    from core.job_scraper import MultiSourceJobScraper
-    from core.job_matcher import IntelligentJobMatcher
-    from core.gap_analyzer import SkillGapAnalyzer
-    from core.learning_roadmap import LearningRoadmapGenerator
-    from core.cover_letter_generator import CoverLetterGenerator
-    from core.resume_tailor import tailor_resume
-    from core.agent_graph import init_agent_graph 
-    from core.interviewer import MockInterviewer
-    from utils.visualizer import ReportVisualizer
-    from utils.pdf_generator import create_resume_pdf
+    from config import DRAFT_LLM_MODEL, QUALITY_LLM_MODEL
 except ImportError as e:
     st.error(f"Error importing core modules: {e}")
     st.stop()
@@ -47,20 +53,34 @@ st.set_page_config(
 )
 
 # --- SESSION STATE INITIALIZATION ---
-if 'analysis_complete' not in st.session_state:
-    st.session_state['analysis_complete'] = False
-if 'resume_profile' not in st.session_state:
-    st.session_state['resume_profile'] = None
+# One table of defaults (pipeline results + Mock Interviewer state), applied in a single pass
+_SESSION_DEFAULTS = {
+    'analysis_complete': False,
+    'resume_profile': None,
+    'profile_stats': None,
+    'resume_text': "",
+    'resume_context': "",
+    'matches': None,
+    'roadmap': None,
+    'charts': None,
+    'interview_history': [],
+    'last_audio': None,
+    'interview_active': False,
+    'interview_round': 1,
+    'last_processed_audio_hash': None,
+    'current_audio': None,
+    'audio_version': 0,
+    'played_audio_version': 0,
+    'selected_interview_job': None,
+    'interview_config': {'focus': 'balanced', 'difficulty': 'medium'},
+}
+for _key, _value in _SESSION_DEFAULTS.items():
+    if _key not in st.session_state:
+        # Copy so sessions never share the default list/dict objects
+        st.session_state[_key] = copy.deepcopy(_value)
 
 if not default_key and "GROQ_API_KEY" in st.secrets:
     default_key = st.secrets["GROQ_API_KEY"]
-    
-# NEW: Add these for the Mock Interviewer
-if 'interview_history' not in st.session_state:
-    st.session_state['interview_history'] = []
-
-if 'last_audio' not in st.session_state:
-    st.session_state['last_audio'] = None
 
 # --- CUSTOM CSS STYLING ---
 st.markdown("""
@@ -97,6 +117,10 @@ st.markdown("""
 
 # --- HELPER FUNCTIONS ---
 
+# Matches the first ```json ... ``` (or bare ```) fenced payload, even with prose
+# before it; non-greedy so a second fenced block is never swallowed into the first
+_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*?\}|\[.*?\])\s*```", re.S)
+
 def safe_json_parse(data):
     """
     Fixes 'AttributeError: str object has no attribute get'.
@@ -108,40 +132,278 @@ def safe_json_parse(data):
     if isinstance(data, str):
         try:
             # Try to clean code blocks if LLM wrapped them in ```json ... ```
-            clean_str = data.strip()
-            if clean_str.startswith("```json"):
-                clean_str = clean_str.split("```json")[1].split("```")[0]
-            elif clean_str.startswith("```"):
-                clean_str = clean_str.split("```")[1].split("```")[0]
+            m = _FENCE_RE.search(data)
+            clean_str = m.group(1) if m else data.strip()
             
-            return json.loads(clean_str)
-        except json.JSONDecodeError:
+            return _json_loads(clean_str)
+        except json.JSONDecodeError:  # orjson.JSONDecodeError subclasses this
             st.warning("Warning: AI response was not valid JSON. Using partial data.")
             return {}
     
     return {}
 
-def save_uploaded_file(uploadedfile):
+def save_uploaded_file(uploadedfile, name: str = None):
     """Helper to save uploaded file to disk so parser can read it."""
     temp_dir = Path("temp_uploads")
     temp_dir.mkdir(exist_ok=True)
-    file_path = temp_dir / uploadedfile.name
-    with open(file_path, "wb") as f:
-        f.write(uploadedfile.getbuffer())
-    return file_path
+    # Unique name (same extension, for the parser) so two sessions uploading
+    # "resume.pdf" at once don't overwrite each other's file
+    suffix = Path(name or uploadedfile.name).suffix
+    with tempfile.NamedTemporaryFile(dir=temp_dir, suffix=suffix, delete=False) as f:
+        # Stream in 1 MB chunks rather than materializing the whole buffer
+        uploadedfile.seek(0)
+        shutil.copyfileobj(uploadedfile, f, length=1024 * 1024)
+    return Path(f.name)
 
-# --- SESSION STATE INITIALIZATION ---
-if 'analysis_complete' not in st.session_state:
-    st.session_state['analysis_complete'] = False
-if 'resume_profile' not in st.session_state:
-    st.session_state['resume_profile'] = None
-if 'resume_text' not in st.session_state:
-    st.session_state['resume_text'] = ""
-if 'matches' not in st.session_state:
-    st.session_state['matches'] = None
-if 'roadmap' not in st.session_state:
-    st.session_state['roadmap'] = None
+def summarize_profile(profile: dict) -> dict:
+    """Flattens the header-metric fields once per analysis, so reruns skip the nested lookups."""
+    exp = profile.get('experience', {})
+    return {
+        'career_level': profile.get('career_level', 'N/A'),
+        'career_stage': profile.get('career_stage', ''),
+        'years': exp.get('total_years', 0) if isinstance(exp, dict) else 0,
+        'total_skills': profile.get('total_skills', 0),
+    }
+
+# --- CACHED RESOURCES ---
+# Heavy objects (embedding model, HTTP sessions, LLM clients) are built once
+# per server process and shared across reruns instead of on every click.
+# Their modules (torch, sentence-transformers, matplotlib) are imported here
+# on first use rather than at the top, so the sidebar paints immediately.
+
+@st.cache_resource(show_spinner=False)
+def get_analyzer():
+    from core.resume_analyzer import UltraIntelligentResumeAnalyzer
+    return UltraIntelligentResumeAnalyzer()
+
+@st.cache_resource(show_spinner=False)
+def get_scraper():
+    from core.job_scraper import MultiSourceJobScraper
+    return MultiSourceJobScraper()
+
+@st.cache_resource(show_spinner=False)
+def get_matcher():
+    from core.job_matcher import IntelligentJobMatcher
+    return IntelligentJobMatcher()
+
+@st.cache_resource(show_spinner=False)
+def get_gap_analyzer():
+    from core.gap_analyzer import SkillGapAnalyzer
+    return SkillGapAnalyzer()
 
+@st.cache_resource(show_spinner=False)
+def get_roadmap_generator(api_key: str):
+    """Keyed on the API key so a key change in the sidebar builds a fresh Groq client."""
+    from core.learning_roadmap import LearningRoadmapGenerator
+    return LearningRoadmapGenerator(api_key=api_key or None)
+
+@st.cache_resource(show_spinner=False)
+def get_visualizer(output_dir: str = "output"):
+    from utils.visualizer import ReportVisualizer
+    Path(output_dir).mkdir(exist_ok=True)
+    return ReportVisualizer(Path(output_dir))
+
+@st.cache_resource(show_spinner=False)
+def get_interviewer(api_key: str):
+    """MockInterviewer holds no per-user state, so one Groq client per key is shared."""
+    from core.interviewer import MockInterviewer
+    return MockInterviewer(api_key=api_key)
+
+@st.cache_resource(show_spinner=False)
+def get_agent_app(api_key: str, model_name: str = DRAFT_LLM_MODEL):
+    """The compiled cover-letter graph has no checkpointer, so it is safe to share per key and model."""
+    from core.agent_graph import init_agent_graph
+    return init_agent_graph(api_key, model_name)
+
+# --- CACHED DATA ---
+# UI-only helpers are memoized with st.cache_data. The pipeline steps
+# (analysis, scraping, gaps, roadmap) are called directly on the core objects:
+# those methods are cached by utils/cache.py (in-process LRU + .cache/ on disk),
+# so each result has exactly one cache and one invalidation rule.
+
+@st.cache_data(show_spinner=False)
+def cached_extract_text(file_bytes: bytes, name: str) -> str:
+    """Parse a resume once per unique upload; keyed on the file bytes."""
+    file_path = save_uploaded_file(BytesIO(file_bytes), name)
+    try:
+        return ResumeParser.extract_text(file_path)
+    finally:
+        file_path.unlink(missing_ok=True)  # Text is cached; the copy isn't needed
+
+@st.cache_data(show_spinner=False)
+def cached_render_charts(skills_cat: dict, jobs: list) -> dict:
+    """
+    Render both charts in parallel as in-memory PNG bytes; skipped entirely when
+    the inputs are unchanged. Nothing touches output/, so sessions can't clobber
+    each other's charts.
+    """
+    vis = get_visualizer("output")
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        radar = ex.submit(vis.generate_skill_radar, skills_cat, BytesIO()) if skills_cat else None
+        cloud = ex.submit(vis.generate_market_wordcloud, jobs, BytesIO())
+        return {
+            'radar': radar.result().getvalue() if radar else None,
+            'wordcloud': cloud.result().getvalue()
+        }
+
+@st.cache_data(ttl=3600, max_entries=128, show_spinner=False)
+def synthesize_speech(_interviewer, text: str) -> bytes:
+    """
+    MP3 bytes for one interviewer line, keyed on the text (the interviewer is not
+    hashed), so a repeated question such as the greeting after Restart is free.
+    The temp file TTS writes is read once and deleted.
+    """
+    path = _interviewer.text_to_speech(text)
+    if not path:
+        raise RuntimeError("TTS produced no audio")  # Raised, so the failure isn't cached
+    try:
+        return Path(path).read_bytes()
+    finally:
+        os.remove(path)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def cached_transcribe(_interviewer, _audio_file, audio_hash: str) -> str:
+    """
+    Whisper transcript keyed on the recording's digest; a replayed recording isn't
+    re-sent. The uploaded file itself is not hashed and is streamed to the client as-is.
+    """
+    text = _interviewer.transcribe_audio(_audio_file)
+    if text.startswith("Error"):
+        raise RuntimeError(text)  # Raised, so the failure isn't cached
+    return text
+
+@st.cache_data(show_spinner=False)
+def build_job_labels(matches: list, limit: int = 10) -> list:
+    """Dropdown labels for the top matches, built once instead of on every rerun."""
+    return [f"{m['company']} - {m['job_title']}" for m in matches[:limit]]
+
+@st.cache_data(show_spinner=False)
+def build_interview_jobs(matches: list, limit: int = 10) -> dict:
+    """Interview position picker for Tab 5: label -> job context, plus a generic option."""
+    job_options = {}
+    for m in matches[:limit]:
+        job_label = f"{m.get('company', 'Unknown')} - {m.get('job_title', 'Position')}"
+        job_options[job_label] = {
+            'company': m.get('company', ''),
+            'title': m.get('job_title', ''),
+            'description': m.get('raw_text', '')[:2000],
+            'score': m.get('overall_score', 0)
+        }
+    
+    # Add generic option
+    job_options["🎯 AI Engineer (Generic Interview)"] = {
+        'company': '',
+        'title': 'AI Engineer',
+        'description': 'General AI/ML engineering interview',
+        'score': 0
+    }
+    return job_options
+
+@st.cache_data(show_spinner=False)
+def build_matches_df(matches: list) -> pd.DataFrame:
+    """Job-matches table for Tab 2; widget reruns reuse it instead of rebuilding."""
+    # Build column-wise so pandas doesn't infer the schema row by row
+    ids, scores, companies, titles, missing_strs = [], [], [], [], []
+    for i, m in enumerate(matches):
+        # Bind each field once; `or` also covers keys present with a None value
+        get = m.get
+        missing = (get('skill_match') or {}).get('missing_required') or []
+        ids.append(i) # Add ID for selection
+        scores.append((get('overall_score') or 0) * 100)
+        companies.append(get('company') or 'N/A')
+        titles.append(get('job_title') or 'N/A')
+        missing_strs.append(", ".join(missing[:3]) if missing else "")
+    
+    return pd.DataFrame({
+        "ID": ids,
+        "Score": scores,
+        "Company": companies,
+        "Title": titles,
+        "Missing": missing_strs
+    })
+
+# --- MOCK INTERVIEW OPTIONS ---
+# Static labels and copy for the interview tab, built once at import instead of per rerun
+
+_FOCUS_OPTIONS = {
+    "balanced": "⚖️ Balanced (50% Technical / 50% Behavioral)",
+    "behavioral": "💬 Behavioral (80% Behavioral / 20% Technical)",
+    "technical": "💻 Technical (90% Technical / 10% Behavioral)"
+}
+_FOCUS_DESC = {
+    "balanced": "Alternates between technical and behavioral questions. Tests both hard and soft skills.",
+    "behavioral": "Focuses on leadership, teamwork, communication, and past experiences. Great for management roles.",
+    "technical": "Deep technical deep-dives into ML algorithms, system design, and coding. For IC roles."
+}
+_FOCUS_EMOJI = {"balanced": "⚖️", "behavioral": "💬", "technical": "💻"}
+_FOCUS_LABEL = {"balanced": "Balanced", "behavioral": "Behavioral", "technical": "Technical"}
+
+_DIFF_OPTIONS = {
+    "entry": "🌱 Entry Level (0-2 years)",
+    "medium": "🚀 Mid Level (2-5 years)",
+    "senior": "⭐ Senior (5-10 years)",
+    "staff": "👑 Staff/Principal (10+ years)"
+}
+_DIFF_DESC = {
+    "entry": "Fundamentals, basic concepts, willingness to learn. Academic projects.",
+    "medium": "Practical implementation, debugging, system design basics. Real-world projects.",
+    "senior": "Architecture, scalability, trade-offs. Leadership and mentoring.",
+    "staff": "Multi-system architecture, org-wide impact. Strategic vision."
+}
+_DIFF_EMOJI = {"entry": "🌱", "medium": "🚀", "senior": "⭐", "staff": "👑"}
+_DIFF_LABEL = {"entry": "Entry", "medium": "Medium", "senior": "Senior", "staff": "Staff"}
+
+_SENIOR_STRUCTURE = """
+- Rounds 1-2: Background & leadership intro
+- Rounds 3-5: System design & architecture
+- Rounds 6-8: Strategic decisions & trade-offs
+- Rounds 9+: Org-level impact & vision
+"""
+_PREVIEW_STRUCTURE = {
+    "entry": """
+- Rounds 1-2: Introduction & basic concepts
+- Rounds 3-5: Fundamental technical/behavioral
+- Rounds 6-8: Applied scenarios
+- Rounds 9+: Learning mindset questions
+""",
+    "senior": _SENIOR_STRUCTURE,
+    "staff": _SENIOR_STRUCTURE,
+    "default": """
+- Rounds 1-2: Warm-up & introduction
+- Rounds 3-5: Core technical/behavioral
+- Rounds 6-8: Problem-solving deep-dive
+- Rounds 9+: Advanced scenarios
+"""
+}
+_PREVIEW_TOPICS = {
+    "behavioral": """
+- Leadership & team collaboration
+- Conflict resolution
+- Project management
+- Stakeholder communication
+- Learning from failure
+""",
+    "technical": """
+- ML algorithms & deep learning
+- System design & architecture
+- MLOps & deployment
+- Code optimization
+- Real-world debugging
+""",
+    "default": """
+- Technical problem-solving
+- Team collaboration
+- System design basics
+- Communication skills
+- Project delivery
+"""
+}
+
+# Chat turns shown by default; older ones are only drawn when asked for
+_VISIBLE_TURNS = 6
+
+# Messages sent to the interviewer LLM per turn (plus the opening greeting)
+_HISTORY_WINDOW = 12
 
 # --- SIDEBAR ---
 with st.sidebar:
@@ -218,61 +480,60 @@ if run_btn:
             
             # --- PHASE 1: RESUME ANALYSIS ---
             status.write("📄 Reading file and parsing text...")
-            file_path = save_uploaded_file(uploaded_file)
-            resume_text = ResumeParser.extract_text(file_path)
+            resume_text = cached_extract_text(uploaded_file.getvalue(), uploaded_file.name)
             st.session_state['resume_text'] = resume_text
+            # Interviewer prompt excerpt, cut once here rather than on every answer
+            st.session_state['resume_context'] = resume_text[:1500]
             
-            status.write("🧠 AI analyzing skills & experience...")
-            analyzer = UltraIntelligentResumeAnalyzer()
-            # Get Raw Result
-            raw_profile = analyzer.analyze_resume(resume_text)
-            # FIX 1: SAFE PARSE TO DICT
-            profile = safe_json_parse(raw_profile)
-            st.session_state['resume_profile'] = profile
+            # Drop blanks from stray commas so "a, b," and "a,b" share one cache entry
+            keywords = [k for k in map(str.strip, keywords_input.split(',')) if k]
             
-            # --- PHASE 2: JOB SEARCH ---
-            status.write("🌍 Scouring the web for live jobs...")
-            keywords = [k.strip() for k in keywords_input.split(',')]
-            scraper = MultiSourceJobScraper()
-            jobs = scraper.search_all_sources(keywords, location_input, max_jobs=10)
+            # The job search only needs the sidebar inputs, so it runs in the
+            # background while the resume is analyzed on the script thread
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                jobs_future = executor.submit(
+                    get_scraper().search_all_sources, keywords, location_input.strip(), max_jobs=10
+                )
+                
+                status.write("🧠 AI analyzing skills & experience...")
+                # Cached on the resume text by the analyzer (FIX 1: SAFE PARSE TO DICT)
+                profile = safe_json_parse(get_analyzer().analyze_resume(resume_text))
+                st.session_state['resume_profile'] = profile
+                st.session_state['profile_stats'] = summarize_profile(profile)
+                
+                # --- PHASE 2: JOB SEARCH ---
+                status.write("🌍 Scouring the web for live jobs...")
+                jobs = jobs_future.result()
             status.write(f"✓ Found {len(jobs)} relevant positions")
             
             # --- PHASE 3: MATCHING ---
             if len(jobs) > 0:
                 status.write("🤝 calculating match scores...")
-                matcher = IntelligentJobMatcher()
-                matches = []
-                for job in jobs:
-                    res = matcher.match_with_intelligent_insights(profile, job)
-                    matches.append(res)
+                matcher = get_matcher()
+                # One vectorized pass over all jobs rather than one model round-trip per job
+                matches = matcher.batch_match(profile, jobs)
                 
                 matches.sort(key=lambda x: x.get('overall_score', 0), reverse=True)
                 st.session_state['matches'] = matches
                 
                 # --- PHASE 4: GAP ANALYSIS & ROADMAP ---
                 status.write("🎓 Identifying skill gaps & building roadmap...")
-                gap_analyzer = SkillGapAnalyzer()
-                gaps = gap_analyzer.analyze_gaps(profile, matches)
+                gaps = get_gap_analyzer().analyze_gaps(profile, matches)
                 
                 # Select top gaps
                 skills_to_learn = gaps.get('critical_gaps', [])[:5] + gaps.get('medium_priority_gaps', [])[:3]
                 
-                roadmap_gen = LearningRoadmapGenerator()
-                roadmap = roadmap_gen.create_personalized_roadmap(
-                            missing_skills=skills_to_learn, 
-                            resume_profile=profile
-                        )
+                roadmap = get_roadmap_generator(os.environ.get("GROQ_API_KEY", "")).create_personalized_roadmap(
+                    missing_skills=skills_to_learn,
+                    resume_profile=profile
+                )
                 st.session_state['roadmap'] = roadmap
                 
                 # --- VISUALS ---
                 status.write("📊 Generating charts...")
-                vis = ReportVisualizer(Path("output"))
-                Path("output").mkdir(exist_ok=True)
-                
-                skills_cat = profile.get('skills_by_category', {})
-                if skills_cat:
-                    vis.generate_skill_radar(skills_cat)
-                vis.generate_market_wordcloud(jobs)
+                st.session_state['charts'] = cached_render_charts(
+                    profile.get('skills_by_category', {}), jobs
+                )
                 
                 status.update(label="✅ Analysis Complete!", state="complete", expanded=False)
                 st.session_state['analysis_complete'] = True
@@ -280,6 +541,546 @@ if run_btn:
                 status.update(label="❌ No jobs found. Try different keywords.", state="error")
                 st.error("No jobs found for these keywords. Please try broader terms.")
 
+# --- DASHBOARD TAB FRAGMENTS ---
+# Each tab is a fragment, so its widgets only rerun that tab instead of the whole dashboard.
+
+_MATCHES_PAGE_SIZE = 10  # Rows per page in the Tab 2 matches table
+
+@st.fragment
+def render_market_tab():
+    """Tab 1: skill radar and market word cloud."""
+    charts = st.session_state.get('charts') or {}
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        st.subheader("Your Skill Distribution")
+        radar_img = charts.get('radar')
+        if radar_img is not None:
+            st.image(radar_img, caption="Skill Radar Chart")
+        else:
+            st.info("Not enough data for Radar Chart.")
+            
+    with col2:
+        st.subheader("Market Demand Heatmap")
+        cloud_img = charts.get('wordcloud')
+        if cloud_img is not None:
+            st.image(cloud_img, caption="Trending Keywords")
+
+
+@st.fragment
+def render_matches_tab(matches):
+    """Tab 2: job-matches table and the resume tailor."""
+    st.subheader("Top Opportunities")
+    
+    if matches:
+        # 1. Display DataFrame (Existing code)
+        df = build_matches_df(matches)
+        
+        # Only one page of rows is serialized to the browser per rerun
+        n_pages = max(1, -(-len(df) // _MATCHES_PAGE_SIZE))
+        page = 1
+        if n_pages > 1:
+            page = st.number_input("Page", min_value=1, max_value=n_pages, value=1)
+        start = (page - 1) * _MATCHES_PAGE_SIZE
+        
+        st.dataframe(
+            df.iloc[start:start + _MATCHES_PAGE_SIZE],
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Score": st.column_config.ProgressColumn("Score", format="%.0f%%", min_value=0, max_value=100)
+            }
+        )
+
+        st.divider()
+
+        # 2. Resume Tailoring Section
+        st.subheader("🎨 AI Resume Tailor")
+        
+        # Select Job
+        job_list = build_job_labels(matches, limit=len(matches))
+        selected_idx = st.selectbox("Select a job to tailor your resume for:", range(len(job_list)), format_func=lambda x: job_list[x])
+        tailor_hq = st.toggle("High-quality (slower)", key="tailor_hq", help="Use Llama 3.3 70B instead of the fast 8B draft model")
+        
+        if st.button("✨ Generate Tailored Resume PDF"):
+            target_job = matches[selected_idx]
+            
+            # API Key Check
+            active_key = groq_key if groq_key else os.environ.get("GROQ_API_KEY")
+            if not active_key:
+                st.error("API Key required.")
+                st.stop()
+
+            # LangChain and xhtml2pdf load on first use rather than at app start
+            from core.resume_tailor import tailor_resume
+            from utils.pdf_generator import create_resume_pdf
+
+            with st.status("Processing...", expanded=True) as status:
+                status.write("📝 Rewriting resume content (Llama 3)...")
+                
+                # 1. Tailor Content (the new summary appears as it is written)
+                summary_preview = st.empty()
+                
+                def show_summary(partial):
+                    if isinstance(partial.get('summary'), str):
+                        summary_preview.caption(partial['summary'])
+                
+                try:
+                    tailored_data = tailor_resume(
+                        st.session_state['resume_profile'], 
+                        # Pass a string representation of the job
+                        f"{target_job['job_title']} at {target_job['company']}. Skills: {target_job.get('raw_text', '')}",
+                        active_key,
+                        on_partial=show_summary,
+                        model_name=QUALITY_LLM_MODEL if tailor_hq else DRAFT_LLM_MODEL
+                    )
+                except RuntimeError as e:
+                    # Never present the untouched original as a tailored resume
+                    status.update(label="Tailoring failed", state="error", expanded=True)
+                    st.error(f"{e}. Please try again.")
+                    return
+                
+                status.write("📄 Rendering PDF...")
+                
+                # 2. Generate PDF
+                pdf_bytes = create_resume_pdf(tailored_data)
+                
+                status.update(label="Done!", state="complete", expanded=False)
+
+                # 3. Download Button
+                st.success(f"Resume tailored for {target_job['company']}!")
+                st.download_button(
+                    label="📥 Download Tailored Resume (.pdf)",
+                    data=pdf_bytes,
+                    file_name=f"Resume_{target_job['company']}.pdf",
+                    mime="application/pdf"
+                )
+    else:
+        st.warning("No matches found.")
+
+
+@st.fragment
+def render_roadmap_tab(roadmap):
+    """Tab 3: personalized learning roadmap."""
+    st.subheader("Your Personalized AI Curriculum")
+    
+    if roadmap and 'detailed_resources' in roadmap:
+        for res in roadmap['detailed_resources']:
+            with st.expander(f"📚 Learn: {res['skill']} ({res.get('estimated_time', 'N/A')})"):
+                c1, c2 = st.columns([2, 1])
+                with c1:
+                    st.markdown(f"**Strategy:** {res.get('strategy_tip', '')}")
+                    st.markdown(f"**Project Idea:** {res.get('recommended_project', '')}")
+                with c2:
+                    st.info(f"**Difficulty:** {res.get('difficulty', 'Medium')}")
+                    
+                st.markdown("**Top Resources:**")
+                for course in res.get('online_courses', [])[:2]:
+                    st.markdown(f"- [{course['name']}]({course['url']})")
+    else:
+        st.info("Roadmap generation pending or failed.")
+
+
+@st.fragment
+def render_cover_letter_tab(matches):
+    """Tab 4: agentic cover letter drafting."""
+    st.subheader("AI Cover Letter Generator")
+    
+    if matches:
+        # Dropdown to select job (labels memoized; selection is an index into matches)
+        job_labels = build_job_labels(matches)
+        selected_idx = st.selectbox(
+            "Select a Job to Apply for:",
+            range(len(job_labels)),
+            format_func=lambda x: job_labels[x]
+        )
+        letter_hq = st.toggle("High-quality (slower)", key="letter_hq", help="Use Llama 3.3 70B instead of the fast 8B draft model")
+        
+        if st.button("✨ Draft Cover Letter (Agentic Mode)", type="primary"):
+    
+            # Check Logic
+            if not st.session_state.get('resume_text'):
+                st.error("Please analyze your resume first.")
+            elif not groq_key and "GROQ_API_KEY" not in os.environ:
+                st.error("Please provide a Groq API Key in the sidebar.")
+            else:
+                # Get the key (either from input or env)
+                active_key = groq_key if groq_key else os.environ.get("GROQ_API_KEY")
+                
+                selected_job = matches[selected_idx]
+                
+                with st.status("🤖 AI Agent Working...", expanded=True) as status:
+                    
+                    # 1. INITIALIZE THE GRAPH (The Fix)
+                    status.write("⚙️ Spinning up AI Agents...")
+                    try:
+                        agent_app = get_agent_app(active_key, QUALITY_LLM_MODEL if letter_hq else DRAFT_LLM_MODEL)
+                    except Exception as e:
+                        st.error(f"Failed to initialize AI: {e}")
+                        st.stop()
+                    
+                    # 2. Setup Input State
+                    initial_state = {
+                        "company_name": selected_job.get('company', 'the company'),
+                        "job_title": selected_job.get('job_title', 'the role'),
+                        "job_description": "See matched skills context.", 
+                        "resume_text": st.session_state['resume_text'],
+                        "research_data": "",
+                        "cover_letter": ""
+                    }
+                    
+                    # 3. Run the Graph, streaming the writer's tokens as they arrive
+                    # The graph's own entry route decides whether research runs
+                    from core.agent_graph import needs_research
+                    researched = needs_research(initial_state)
+                    if researched:
+                        status.write("🕵️ Researching Company Culture & News...")
+                    else:
+                        status.write("✍️ Drafting Personalized Letter (no company research for this listing)...")
+                    result = {}
+
+                    def letter_tokens():
+                        for mode, chunk in agent_app.stream(initial_state, stream_mode=["updates", "messages"]):
+                            if mode == "messages":
+                                msg, meta = chunk
+                                if meta.get("langgraph_node") == "writer" and msg.content:
+                                    yield msg.content
+                            elif "researcher" in chunk:
+                                status.write("✍️ Drafting Personalized Letter...")
+                            elif "writer" in chunk:
+                                result.update(chunk["writer"])
+
+                    streamed = st.write_stream(letter_tokens())
+                    final_letter = result.get('cover_letter') or streamed
+                    
+                    status.update(label="✅ Draft Complete!", state="complete", expanded=False)
+                    
+                # 4. Display Result
+                st.subheader("Agent-Generated Letter")
+                if researched:
+                    st.caption(f"Incorporating research on: {initial_state['company_name']}")
+                st.text_area("Edit your letter:", value=final_letter, height=500)
+                
+                st.download_button(
+                    label="📥 Download .txt",
+                    data=final_letter,
+                    file_name="Agentic_Cover_Letter.txt",
+                    mime="text/plain"
+                )
+    else:
+        st.warning("Please run analysis to find jobs first.")
+
+
+def question_audio(interviewer, text: str):
+    """synthesize_speech, or None when both TTS engines failed."""
+    try:
+        return synthesize_speech(interviewer, text)
+    except (RuntimeError, OSError):
+        return None
+
+@st.fragment
+def render_interview_setup(interviewer, matches):
+    """Tab 5, Scene 1: position, focus and difficulty. Picking options only reruns this fragment."""
+    # === JOB SELECTION ===
+    st.subheader("📋 Step 1: Select Target Position")
+    
+    if matches and len(matches) > 0:
+        # Job options are derived from the matches once, not on every rerun
+        job_options = build_interview_jobs(matches)
+        
+        selected_job_label = st.selectbox(
+            "Choose a position:",
+            list(job_options.keys()),
+            help="Select a specific job for tailored interview questions"
+        )
+        
+        selected_job_data = job_options[selected_job_label]
+        
+        # Display job details
+        if selected_job_data['company']:
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                st.info(f"**Company:** {selected_job_data['company']}  \n**Role:** {selected_job_data['title']}")
+            with col2:
+                st.metric("Match", f"{selected_job_data['score']:.0%}")
+    else:
+        st.info("💡 No job matches found. Starting with generic AI Engineer interview.")
+        selected_job_data = {
+            'company': '',
+            'title': 'AI Engineer',
+            'description': 'General AI/ML engineering interview',
+            'score': 0
+        }
+    
+    st.divider()
+    
+    # === INTERVIEW CONFIGURATION ===
+    st.subheader("⚙️ Step 2: Configure Interview Settings")
+    
+    col_a, col_b = st.columns(2)
+    
+    with col_a:
+        st.markdown("**Interview Focus**")
+        focus_option = st.radio(
+            "Select primary focus:",
+            options=list(_FOCUS_OPTIONS),
+            format_func=_FOCUS_OPTIONS.__getitem__,
+            help="Choose what aspect of the interview to emphasize",
+            key="focus_radio"
+        )
+        
+        # Description
+        st.caption(_FOCUS_DESC[focus_option])
+    
+    with col_b:
+        st.markdown("**Difficulty Level**")
+        difficulty_option = st.radio(
+            "Select experience level:",
+            options=list(_DIFF_OPTIONS),
+            format_func=_DIFF_OPTIONS.__getitem__,
+            help="Match your current experience level",
+            key="difficulty_radio"
+        )
+        
+        # Description
+        st.caption(_DIFF_DESC[difficulty_option])
+    
+    # Save config
+    st.session_state.interview_config = {
+        'focus': focus_option,
+        'difficulty': difficulty_option
+    }
+    
+    st.divider()
+    
+    # === INTERVIEW PREVIEW ===
+    st.subheader("📖 What to Expect")
+    
+    preview_col1, preview_col2 = st.columns(2)
+    
+    with preview_col1:
+        st.markdown("**Interview Structure:**")
+        st.markdown(_PREVIEW_STRUCTURE.get(difficulty_option, _PREVIEW_STRUCTURE["default"]))
+    
+    with preview_col2:
+        st.markdown("**Sample Topics:**")
+        st.markdown(_PREVIEW_TOPICS.get(focus_option, _PREVIEW_TOPICS["default"]))
+    
+    st.divider()
+    
+    # === START BUTTON ===
+    st.info("💡 **Pro Tip:** Have specific examples from your experience ready. Use the STAR method for behavioral questions (Situation, Task, Action, Result).")
+    
+    if st.button("🚀 Start Interview Session", type="primary", use_container_width=True):
+        st.session_state.interview_active = True
+        st.session_state.selected_interview_job = selected_job_data
+        
+        with st.spinner("Initializing AI interviewer..."):
+            # Generate personalized greeting
+            greeting = interviewer.generate_initial_greeting(
+                target_role=selected_job_data['title'],
+                company_name=selected_job_data['company'],
+                job_description=selected_job_data['description'],
+                interview_focus=st.session_state.interview_config['focus'],
+                difficulty=st.session_state.interview_config['difficulty']
+            )
+            
+            st.session_state.interview_history = [{
+                "role": "assistant", 
+                "content": greeting['question'],
+                "sample_answer": greeting['sample_answer']
+            }]
+            st.session_state.interview_round = 1
+            
+            # Generate audio
+            st.session_state.current_audio = question_audio(interviewer, greeting['question'])
+            st.session_state.audio_version += 1
+            
+            if st.session_state.current_audio is None:
+                st.warning("Audio generation had issues, but interview will continue.")
+        
+        st.rerun()  # Full rerun: swapping to Scene 2 happens outside this fragment
+
+
+@st.fragment
+def render_interview_session(interviewer):
+    """Tab 5, Scene 2: the live interview. Each answer only reruns this fragment."""
+    # ✅ FIX: Add null safety checks
+    job_context = st.session_state.selected_interview_job
+    config = st.session_state.interview_config
+    
+    # ✅ FIX: Provide default values if job_context is None
+    if job_context is None:
+        job_context = {
+            'company': '',
+            'title': 'AI Engineer',
+            'description': 'General AI/ML engineering interview',
+            'score': 0
+        }
+        st.session_state.selected_interview_job = job_context
+    
+    # ✅ FIX: Provide default config if None
+    if config is None:
+        config = {
+            'focus': 'balanced',
+            'difficulty': 'medium'
+        }
+        st.session_state.interview_config = config
+    
+    # === HEADER ===
+    if job_context.get('company'):
+        st.info(f"🎯 **Interviewing for**: {job_context['title']} at {job_context['company']}")
+    else:
+        st.info(f"🎯 **Position**: {job_context.get('title', 'AI Engineer')} (Generic Interview)")
+    
+    # Config badges and toolbar share one row: a single layout call per rerun
+    col_focus, col_diff, col_round, col_restart, col_exit = st.columns([2, 2, 2, 1, 1])
+    with col_focus:
+        current_focus = config.get('focus', 'balanced')
+        st.caption(f"{_FOCUS_EMOJI.get(current_focus, '⚖️')} Focus: **{_FOCUS_LABEL.get(current_focus, current_focus)}**")
+    with col_diff:
+        current_diff = config.get('difficulty', 'medium')
+        st.caption(f"{_DIFF_EMOJI.get(current_diff, '🚀')} Level: **{_DIFF_LABEL.get(current_diff, current_diff)}**")
+    with col_round:
+        st.caption(f"🔴 Live · **Round {st.session_state.interview_round}**")
+    
+    # === TOOLBAR ===
+    with col_restart:
+        if st.button("🔄 Restart", help="Keep settings, restart conversation"):
+            st.session_state.interview_history = []
+            st.session_state.last_processed_audio_hash = None
+            st.session_state.current_audio = None
+            
+            # Regenerate greeting
+            greeting = interviewer.generate_initial_greeting(
+                target_role=job_context.get('title', 'AI Engineer'),
+                company_name=job_context.get('company', ''),
+                job_description=job_context.get('description', ''),
+                interview_focus=config.get('focus', 'balanced'),
+                difficulty=config.get('difficulty', 'medium')
+            )
+            st.session_state.interview_history = [{
+                "role": "assistant", 
+                "content": greeting['question'],
+                "sample_answer": greeting['sample_answer']
+            }]
+            st.session_state.interview_round = 1
+            st.session_state.current_audio = question_audio(interviewer, greeting['question'])
+            st.session_state.audio_version += 1
+            st.rerun(scope="fragment")
+    with col_exit: 
+        if st.button("❌ Exit"):
+            st.session_state.interview_active = False
+            st.session_state.interview_history = []
+            st.session_state.current_audio = None
+            st.session_state.selected_interview_job = None
+            st.rerun()  # Full rerun: Scene 1 lives outside this fragment
+    
+    st.divider()
+
+    # === AUDIO PLAYER ===
+    # Clips are held in memory, so replaying one on rerun never touches the disk.
+    # Only a new clip autoplays; other reruns (history toggle, etc.) leave it paused.
+    if st.session_state.current_audio:
+        new_clip = st.session_state.audio_version != st.session_state.played_audio_version
+        st.audio(
+            st.session_state.current_audio, 
+            format="audio/mp3", 
+            autoplay=new_clip
+        )
+        st.session_state.played_audio_version = st.session_state.audio_version
+
+    # === CHAT HISTORY ===
+    history = st.session_state.interview_history
+    visible_from = max(len(history) - _VISIBLE_TURNS * 2, 0)
+    if visible_from and st.toggle("Show full history", key="interview_show_full_history",
+                                  help=f"{visible_from} earlier messages are hidden"):
+        visible_from = 0
+    
+    chat_container = st.container()
+    with chat_container:
+        for message in history[visible_from:]:
+            with st.chat_message(message["role"]):
+                st.write(message["content"])
+                
+                # Sample Answer
+                if message["role"] == "assistant" and "sample_answer" in message:
+                    with st.expander("💡 View Sample Answer / Hint"):
+                        st.info(message["sample_answer"])
+
+    # === AUDIO INPUT ===
+    if _HAS_AUDIO_INPUT:
+        audio_value = st.audio_input("🎙️ Record your answer")
+    else:
+        st.error("Please upgrade Streamlit to the latest version.")
+        st.stop()
+
+    # === PROCESS INPUT ===
+    # Dedup on a digest of the recording rather than holding the UploadedFile itself;
+    # hashed through a buffer view, so the recording is never copied to bytes
+    audio_hash = None
+    if audio_value is not None:
+        with audio_value.getbuffer() as view:
+            audio_hash = hashlib.sha256(view).hexdigest() if view.nbytes else None
+    if audio_hash and audio_hash != st.session_state.last_processed_audio_hash:
+        with st.spinner("🎧 Analyzing your response..."):
+            st.session_state.last_processed_audio_hash = audio_hash
+            
+            # 1. Transcribe
+            try:
+                user_text = cached_transcribe(interviewer, audio_value, audio_hash)
+            except RuntimeError as e:
+                st.error(str(e))
+                st.stop()
+            
+            st.session_state.interview_history.append({
+                "role": "user", 
+                "content": user_text
+            })
+            # Show the transcript now instead of after the whole turn completes
+            with chat_container:
+                with st.chat_message("user"):
+                    st.write(user_text)
+            
+            # 2. Get AI Response with full context
+            resume_context = st.session_state['resume_context']
+            
+            # Rolling window keeps the prompt size flat; the greeting stays as the anchor.
+            # The window must open on a user answer, never on a question whose answer was cut off
+            history = st.session_state.interview_history
+            if len(history) > _HISTORY_WINDOW + 1:
+                window = history[-_HISTORY_WINDOW:]
+                if window[0]["role"] == "assistant":
+                    window = window[1:]
+                history = history[:1] + window
+            
+            ai_response = interviewer.get_ai_response(
+                history=history, 
+                target_role=job_context.get('title', 'AI Engineer'),
+                company_name=job_context.get('company', ''),
+                job_description=job_context.get('description', ''),
+                resume_context=resume_context,
+                interview_focus=config.get('focus', 'balanced'),
+                difficulty=config.get('difficulty', 'medium')
+            )
+            
+            # 3. Save response
+            st.session_state.interview_history.append({
+                "role": "assistant", 
+                "content": ai_response['question'],
+                "sample_answer": ai_response['sample_answer']
+            })
+            st.session_state.interview_round += 1
+            
+            # 4. Show the question, then synthesize its audio for the rerun
+            with chat_container:
+                with st.chat_message("assistant"):
+                    st.write(ai_response['question'])
+            st.session_state.current_audio = question_audio(interviewer, ai_response['question'])
+            st.session_state.audio_version += 1
+            
+            st.rerun(scope="fragment")
+
+
 # --- DASHBOARD DISPLAY ---
 
 if st.session_state['analysis_complete']:
@@ -298,19 +1099,17 @@ if st.session_state['analysis_complete']:
     # Top Stats Row
     col1, col2, col3, col4 = st.columns(4)
     
+    stats = st.session_state['profile_stats'] or summarize_profile(profile)
+    
     with col1: 
-        career_level = profile.get('career_level', 'N/A')
-        career_stage = profile.get('career_stage', '')
-        st.metric("Career Level", career_level, delta=career_stage, delta_color="off")
+        st.metric("Career Level", stats['career_level'], delta=stats['career_stage'], delta_color="off")
     
     with col2:
-        exp = profile.get('experience', {})
-        years = exp.get('total_years', 0) if isinstance(exp, dict) else 0
+        years = stats['years']
         st.metric("Experience", f"{years} Year{'s' if years != 1 else ''}")
     
     with col3: 
-        total_skills = profile.get('total_skills', 0)
-        st.metric("Skills Identified", total_skills)
+        st.metric("Skills Identified", stats['total_skills'])
     
     with col4: 
         jobs_count = len(matches) if matches else 0
@@ -366,8 +1165,13 @@ if st.session_state['analysis_complete']:
         st.subheader("🏆 Achievements Detected")
         achievements = profile.get('achievements', [])
         if achievements:
-            metric_achievements = [a for a in achievements if 'metric' in a]
-            recognition_achievements = [a for a in achievements if 'type' == 'recognition']
+            # Single pass; recognitions are tagged with type == 'recognition' by the analyzer
+            metric_achievements, recognition_achievements = [], []
+            for a in achievements:
+                if 'metric' in a:
+                    metric_achievements.append(a)
+                if a.get('type') == 'recognition':
+                    recognition_achievements.append(a)
             
             st.metric("Quantifiable Results", len(metric_achievements))
             st.metric("Recognitions", len(recognition_achievements))
@@ -453,170 +1257,19 @@ if st.session_state['analysis_complete']:
     
     # === TAB 1: PROFILE ===
     with tab1:
-        col1, col2 = st.columns([1, 1])
-        with col1:
-            st.subheader("Your Skill Distribution")
-            if os.path.exists("output/visual_skill_radar.png"):
-                st.image("output/visual_skill_radar.png", caption="Skill Radar Chart")
-            else:
-                st.info("Not enough data for Radar Chart.")
-                
-        with col2:
-            st.subheader("Market Demand Heatmap")
-            if os.path.exists("output/visual_market_wordcloud.png"):
-                st.image("output/visual_market_wordcloud.png", caption="Trending Keywords")
-                
+        render_market_tab()
+
     # === TAB 2: JOB MATCHES ===
     with tab2:
-        st.subheader("Top Opportunities")
-        
-        if matches:
-            # 1. Display DataFrame (Existing code)
-            df_data = []
-            for i, m in enumerate(matches):
-                skill_match = m.get('skill_match', {})
-                missing = skill_match.get('missing_required', [])
-                df_data.append({
-                    "ID": i, # Add ID for selection
-                    "Score": f"{m.get('overall_score', 0):.0%}",
-                    "Company": m.get('company', 'N/A'),
-                    "Title": m.get('job_title', 'N/A'),
-                    "Missing": ", ".join(missing[:3])
-                })
-            
-            st.dataframe(pd.DataFrame(df_data), use_container_width=True, hide_index=True)
+        render_matches_tab(matches)
 
-            st.divider()
-
-            # 2. Resume Tailoring Section
-            st.subheader("🎨 AI Resume Tailor")
-            
-            # Select Job
-            job_list = [f"{m['company']} - {m['job_title']}" for m in matches]
-            selected_idx = st.selectbox("Select a job to tailor your resume for:", range(len(job_list)), format_func=lambda x: job_list[x])
-            
-            if st.button("✨ Generate Tailored Resume PDF"):
-                target_job = matches[selected_idx]
-                
-                # API Key Check
-                active_key = groq_key if groq_key else os.environ.get("GROQ_API_KEY")
-                if not active_key:
-                    st.error("API Key required.")
-                    st.stop()
-
-                with st.status("Processing...", expanded=True) as status:
-                    status.write("📝 Rewriting resume content (Llama 3)...")
-                    
-                    # 1. Tailor Content
-                    tailored_data = tailor_resume(
-                        st.session_state['resume_profile'], 
-                        # Pass a string representation of the job
-                        f"{target_job['job_title']} at {target_job['company']}. Skills: {target_job.get('raw_text', '')}",
-                        active_key
-                    )
-                    
-                    status.write("📄 Rendering PDF...")
-                    
-                    # 2. Generate PDF
-                    pdf_bytes = create_resume_pdf(tailored_data)
-                    
-                    status.update(label="Done!", state="complete", expanded=False)
-
-                    # 3. Download Button
-                    st.success(f"Resume tailored for {target_job['company']}!")
-                    st.download_button(
-                        label="📥 Download Tailored Resume (.pdf)",
-                        data=pdf_bytes,
-                        file_name=f"Resume_{target_job['company']}.pdf",
-                        mime="application/pdf"
-                    )
-        else:
-            st.warning("No matches found.")
-        
     # === TAB 3: ROADMAP ===
     with tab3:
-        st.subheader("Your Personalized AI Curriculum")
-        
-        if roadmap and 'detailed_resources' in roadmap:
-            for res in roadmap['detailed_resources']:
-                with st.expander(f"📚 Learn: {res['skill']} ({res.get('estimated_time', 'N/A')})"):
-                    c1, c2 = st.columns([2, 1])
-                    with c1:
-                        st.markdown(f"**Strategy:** {res.get('strategy_tip', '')}")
-                        st.markdown(f"**Project Idea:** {res.get('recommended_project', '')}")
-                    with c2:
-                        st.info(f"**Difficulty:** {res.get('difficulty', 'Medium')}")
-                        
-                    st.markdown("**Top Resources:**")
-                    for course in res.get('online_courses', [])[:2]:
-                        st.markdown(f"- [{course['name']}]({course['url']})")
-        else:
-            st.info("Roadmap generation pending or failed.")
+        render_roadmap_tab(roadmap)
 
     # === TAB 4: COVER LETTER ===
     with tab4:
-        st.subheader("AI Cover Letter Generator")
-        
-        if matches:
-            # Dropdown to select job
-            job_options = {f"{m['company']} - {m['job_title']}": m for m in matches[:10]}
-            selected_job_name = st.selectbox("Select a Job to Apply for:", list(job_options.keys()))
-            
-            if st.button("✨ Draft Cover Letter (Agentic Mode)", type="primary"):
-        
-                # Check Logic
-                if not st.session_state.get('resume_text'):
-                    st.error("Please analyze your resume first.")
-                elif not groq_key and "GROQ_API_KEY" not in os.environ:
-                    st.error("Please provide a Groq API Key in the sidebar.")
-                else:
-                    # Get the key (either from input or env)
-                    active_key = groq_key if groq_key else os.environ.get("GROQ_API_KEY")
-                    
-                    selected_job = job_options[selected_job_name]
-                    
-                    with st.status("🤖 AI Agent Working...", expanded=True) as status:
-                        
-                        # 1. INITIALIZE THE GRAPH (The Fix)
-                        status.write("⚙️ Spinning up AI Agents...")
-                        try:
-                            agent_app = init_agent_graph(active_key)
-                        except Exception as e:
-                            st.error(f"Failed to initialize AI: {e}")
-                            st.stop()
-                        
-                        # 2. Setup Input State
-                        initial_state = {
-                            "company_name": selected_job.get('company', 'the company'),
-                            "job_title": selected_job.get('job_title', 'the role'),
-                            "job_description": "See matched skills context.", 
-                            "resume_text": st.session_state['resume_text'],
-                            "research_data": "",
-                            "cover_letter": ""
-                        }
-                        
-                        # 3. Run the Graph
-                        status.write("🕵️ Researching Company Culture & News...")
-                        result = agent_app.invoke(initial_state)
-                        
-                        status.write("✍️ Drafting Personalized Letter...")
-                        final_letter = result['cover_letter']
-                        
-                        status.update(label="✅ Draft Complete!", state="complete", expanded=False)
-                        
-                        # 4. Display Result
-                        st.subheader("Agent-Generated Letter")
-                        st.caption(f"Incorporating research on: {result['company_name']}")
-                        st.text_area("Edit your letter:", value=final_letter, height=500)
-                        
-                        st.download_button(
-                            label="📥 Download .txt",
-                            data=final_letter,
-                            file_name="Agentic_Cover_Letter.txt",
-                            mime="text/plain"
-                        )
-        else:
-            st.warning("Please run analysis to find jobs first.")
+        render_cover_letter_tab(matches)
     
     # === TAB 5: ENHANCED MOCK INTERVIEW ===
     with tab5:
@@ -628,394 +1281,19 @@ if st.session_state['analysis_complete']:
             st.warning("⚠️ Please enter your Groq API Key.")
             st.stop() 
 
-        # State Management
-        if 'interview_active' not in st.session_state: 
-            st.session_state.interview_active = False
-        if 'interview_history' not in st.session_state: 
-            st.session_state.interview_history = []
-        if 'last_processed_audio' not in st.session_state: 
-            st.session_state.last_processed_audio = None
-        if 'current_audio_path' not in st.session_state: 
-            st.session_state.current_audio_path = None
-        if 'selected_interview_job' not in st.session_state:
-            st.session_state.selected_interview_job = None
-        if 'interview_config' not in st.session_state:
-            st.session_state.interview_config = {
-                'focus': 'balanced',
-                'difficulty': 'medium'
-            }
-        
         try:
-            interviewer = MockInterviewer(api_key=active_key)
+            interviewer = get_interviewer(active_key)
         except Exception as e:
             st.error(f"Init Error: {e}")
             st.stop()
 
-        # Helper: Cleanup
-        def cleanup_old_audio():
-            if st.session_state.current_audio_path and os.path.exists(st.session_state.current_audio_path):
-                try:
-                    os.remove(st.session_state.current_audio_path)
-                except:
-                    pass
-
         # --- SCENE 1: CONFIGURATION & START ---
         if not st.session_state.interview_active:
-            
-            # === JOB SELECTION ===
-            st.subheader("📋 Step 1: Select Target Position")
-            
-            if matches and len(matches) > 0:
-                # Create job options
-                job_options = {}
-                for idx, m in enumerate(matches[:10]):
-                    job_label = f"{m.get('company', 'Unknown')} - {m.get('job_title', 'Position')}"
-                    match_score = m.get('overall_score', 0)
-                    job_options[job_label] = {
-                        'company': m.get('company', ''),
-                        'title': m.get('job_title', ''),
-                        'description': m.get('raw_text', '')[:2000],
-                        'score': match_score
-                    }
-                
-                # Add generic option
-                job_options["🎯 AI Engineer (Generic Interview)"] = {
-                    'company': '',
-                    'title': 'AI Engineer',
-                    'description': 'General AI/ML engineering interview',
-                    'score': 0
-                }
-                
-                selected_job_label = st.selectbox(
-                    "Choose a position:",
-                    list(job_options.keys()),
-                    help="Select a specific job for tailored interview questions"
-                )
-                
-                selected_job_data = job_options[selected_job_label]
-                
-                # Display job details
-                if selected_job_data['company']:
-                    col1, col2 = st.columns([3, 1])
-                    with col1:
-                        st.info(f"**Company:** {selected_job_data['company']}  \n**Role:** {selected_job_data['title']}")
-                    with col2:
-                        st.metric("Match", f"{selected_job_data['score']:.0%}")
-            else:
-                st.info("💡 No job matches found. Starting with generic AI Engineer interview.")
-                selected_job_data = {
-                    'company': '',
-                    'title': 'AI Engineer',
-                    'description': 'General AI/ML engineering interview',
-                    'score': 0
-                }
-            
-            st.divider()
-            
-            # === INTERVIEW CONFIGURATION ===
-            st.subheader("⚙️ Step 2: Configure Interview Settings")
-            
-            col_a, col_b = st.columns(2)
-            
-            with col_a:
-                st.markdown("**Interview Focus**")
-                focus_option = st.radio(
-                    "Select primary focus:",
-                    options=["balanced", "behavioral", "technical"],
-                    format_func=lambda x: {
-                        "balanced": "⚖️ Balanced (50% Technical / 50% Behavioral)",
-                        "behavioral": "💬 Behavioral (80% Behavioral / 20% Technical)",
-                        "technical": "💻 Technical (90% Technical / 10% Behavioral)"
-                    }[x],
-                    help="Choose what aspect of the interview to emphasize",
-                    key="focus_radio"
-                )
-                
-                # Description
-                focus_descriptions = {
-                    "balanced": "Alternates between technical and behavioral questions. Tests both hard and soft skills.",
-                    "behavioral": "Focuses on leadership, teamwork, communication, and past experiences. Great for management roles.",
-                    "technical": "Deep technical deep-dives into ML algorithms, system design, and coding. For IC roles."
-                }
-                st.caption(focus_descriptions[focus_option])
-            
-            with col_b:
-                st.markdown("**Difficulty Level**")
-                difficulty_option = st.radio(
-                    "Select experience level:",
-                    options=["entry", "medium", "senior", "staff"],
-                    format_func=lambda x: {
-                        "entry": "🌱 Entry Level (0-2 years)",
-                        "medium": "🚀 Mid Level (2-5 years)",
-                        "senior": "⭐ Senior (5-10 years)",
-                        "staff": "👑 Staff/Principal (10+ years)"
-                    }[x],
-                    help="Match your current experience level",
-                    key="difficulty_radio"
-                )
-                
-                # Description
-                difficulty_descriptions = {
-                    "entry": "Fundamentals, basic concepts, willingness to learn. Academic projects.",
-                    "medium": "Practical implementation, debugging, system design basics. Real-world projects.",
-                    "senior": "Architecture, scalability, trade-offs. Leadership and mentoring.",
-                    "staff": "Multi-system architecture, org-wide impact. Strategic vision."
-                }
-                st.caption(difficulty_descriptions[difficulty_option])
-            
-            # Save config
-            st.session_state.interview_config = {
-                'focus': focus_option,
-                'difficulty': difficulty_option
-            }
-            
-            st.divider()
-            
-            # === INTERVIEW PREVIEW ===
-            st.subheader("📖 What to Expect")
-            
-            preview_col1, preview_col2 = st.columns(2)
-            
-            with preview_col1:
-                st.markdown("**Interview Structure:**")
-                if difficulty_option == "entry":
-                    st.markdown("""
-                    - Rounds 1-2: Introduction & basic concepts
-                    - Rounds 3-5: Fundamental technical/behavioral
-                    - Rounds 6-8: Applied scenarios
-                    - Rounds 9+: Learning mindset questions
-                    """)
-                elif difficulty_option in ["senior", "staff"]:
-                    st.markdown("""
-                    - Rounds 1-2: Background & leadership intro
-                    - Rounds 3-5: System design & architecture
-                    - Rounds 6-8: Strategic decisions & trade-offs
-                    - Rounds 9+: Org-level impact & vision
-                    """)
-                else:
-                    st.markdown("""
-                    - Rounds 1-2: Warm-up & introduction
-                    - Rounds 3-5: Core technical/behavioral
-                    - Rounds 6-8: Problem-solving deep-dive
-                    - Rounds 9+: Advanced scenarios
-                    """)
-            
-            with preview_col2:
-                st.markdown("**Sample Topics:**")
-                if focus_option == "behavioral":
-                    st.markdown("""
-                    - Leadership & team collaboration
-                    - Conflict resolution
-                    - Project management
-                    - Stakeholder communication
-                    - Learning from failure
-                    """)
-                elif focus_option == "technical":
-                    st.markdown("""
-                    - ML algorithms & deep learning
-                    - System design & architecture
-                    - MLOps & deployment
-                    - Code optimization
-                    - Real-world debugging
-                    """)
-                else:
-                    st.markdown("""
-                    - Technical problem-solving
-                    - Team collaboration
-                    - System design basics
-                    - Communication skills
-                    - Project delivery
-                    """)
-            
-            st.divider()
-            
-            # === START BUTTON ===
-            st.info("💡 **Pro Tip:** Have specific examples from your experience ready. Use the STAR method for behavioral questions (Situation, Task, Action, Result).")
-            
-            if st.button("🚀 Start Interview Session", type="primary", use_container_width=True):
-                st.session_state.interview_active = True
-                st.session_state.selected_interview_job = selected_job_data
-                
-                with st.spinner("Initializing AI interviewer..."):
-                    # Generate personalized greeting
-                    greeting = interviewer.generate_initial_greeting(
-                        target_role=selected_job_data['title'],
-                        company_name=selected_job_data['company'],
-                        job_description=selected_job_data['description'],
-                        interview_focus=st.session_state.interview_config['focus'],
-                        difficulty=st.session_state.interview_config['difficulty']
-                    )
-                    
-                    st.session_state.interview_history = [{
-                        "role": "assistant", 
-                        "content": greeting['question'],
-                        "sample_answer": greeting['sample_answer']
-                    }]
-                    
-                    # Generate audio
-                    cleanup_old_audio()
-                    new_path = interviewer.text_to_speech(greeting['question'])
-                    
-                    if new_path:
-                        st.session_state.current_audio_path = new_path
-                    else:
-                        st.warning("Audio generation had issues, but interview will continue.")
-                
-                st.rerun()
+            render_interview_setup(interviewer, matches)
 
         # --- SCENE 2: ACTIVE INTERVIEW ---
         else:
-            # ✅ FIX: Add null safety checks
-            job_context = st.session_state.selected_interview_job
-            config = st.session_state.interview_config
-            
-            # ✅ FIX: Provide default values if job_context is None
-            if job_context is None:
-                job_context = {
-                    'company': '',
-                    'title': 'AI Engineer',
-                    'description': 'General AI/ML engineering interview',
-                    'score': 0
-                }
-                st.session_state.selected_interview_job = job_context
-            
-            # ✅ FIX: Provide default config if None
-            if config is None:
-                config = {
-                    'focus': 'balanced',
-                    'difficulty': 'medium'
-                }
-                st.session_state.interview_config = config
-            
-            # === HEADER ===
-            if job_context.get('company'):
-                st.info(f"🎯 **Interviewing for**: {job_context['title']} at {job_context['company']}")
-            else:
-                st.info(f"🎯 **Position**: {job_context.get('title', 'AI Engineer')} (Generic Interview)")
-            
-            # Show config badges
-            col_info1, col_info2, col_info3 = st.columns(3)
-            with col_info1:
-                focus_emoji = {"balanced": "⚖️", "behavioral": "💬", "technical": "💻"}
-                current_focus = config.get('focus', 'balanced')
-                st.caption(f"{focus_emoji.get(current_focus, '⚖️')} Focus: **{current_focus.title()}**")
-            with col_info2:
-                diff_emoji = {"entry": "🌱", "medium": "🚀", "senior": "⭐", "staff": "👑"}
-                current_diff = config.get('difficulty', 'medium')
-                st.caption(f"{diff_emoji.get(current_diff, '🚀')} Level: **{current_diff.title()}**")
-            with col_info3:
-                round_num = len(st.session_state.interview_history) // 2 + 1
-                st.caption(f"🔴 **Round {round_num}**")
-            
-            st.divider()
-            
-            # === TOOLBAR ===
-            col_a, col_b, col_c = st.columns([3, 1, 1])
-            with col_a: 
-                st.caption("🔴 Live Session Active")
-            with col_b:
-                if st.button("🔄 Restart", help="Keep settings, restart conversation"):
-                    cleanup_old_audio()
-                    st.session_state.interview_history = []
-                    st.session_state.last_processed_audio = None
-                    st.session_state.current_audio_path = None
-                    
-                    # Regenerate greeting
-                    greeting = interviewer.generate_initial_greeting(
-                        target_role=job_context.get('title', 'AI Engineer'),
-                        company_name=job_context.get('company', ''),
-                        job_description=job_context.get('description', ''),
-                        interview_focus=config.get('focus', 'balanced'),
-                        difficulty=config.get('difficulty', 'medium')
-                    )
-                    st.session_state.interview_history = [{
-                        "role": "assistant", 
-                        "content": greeting['question'],
-                        "sample_answer": greeting['sample_answer']
-                    }]
-                    new_path = interviewer.text_to_speech(greeting['question'])
-                    st.session_state.current_audio_path = new_path
-                    st.rerun()
-            with col_c: 
-                if st.button("❌ Exit"):
-                    cleanup_old_audio()
-                    st.session_state.interview_active = False
-                    st.session_state.interview_history = []
-                    st.session_state.current_audio_path = None
-                    st.session_state.selected_interview_job = None
-                    st.rerun()
-
-            # === AUDIO PLAYER ===
-            if st.session_state.current_audio_path and os.path.exists(st.session_state.current_audio_path):
-                st.audio(
-                    st.session_state.current_audio_path, 
-                    format="audio/mp3", 
-                    autoplay=True
-                )
+            render_interview_session(interviewer)
 
-            # === CHAT HISTORY ===
-            chat_container = st.container()
-            with chat_container:
-                for idx, message in enumerate(st.session_state.interview_history):
-                    with st.chat_message(message["role"]):
-                        st.write(message["content"])
-                        
-                        # Sample Answer
-                        if message["role"] == "assistant" and "sample_answer" in message:
-                            with st.expander("💡 View Sample Answer / Hint"):
-                                st.info(message["sample_answer"])
-
-            # === AUDIO INPUT ===
-            if hasattr(st, 'audio_input'):
-                audio_value = st.audio_input("🎙️ Record your answer")
-            else:
-                st.error("Please upgrade Streamlit to the latest version.")
-                st.stop()
-
-            # === PROCESS INPUT ===
-            if audio_value is not None and audio_value != st.session_state.last_processed_audio:
-                with st.spinner("🎧 Analyzing your response..."):
-                    st.session_state.last_processed_audio = audio_value
-                    
-                    # 1. Transcribe
-                    user_text = interviewer.transcribe_audio(audio_value)
-                    
-                    if user_text.startswith("Error"):
-                        st.error(user_text)
-                        st.stop()
-                    
-                    st.session_state.interview_history.append({
-                        "role": "user", 
-                        "content": user_text
-                    })
-                    
-                    # 2. Get AI Response with full context
-                    resume_data = st.session_state.get('resume_profile', {})
-                    resume_context = st.session_state.get('resume_text', '')[:1500]
-                    
-                    ai_response = interviewer.get_ai_response(
-                        history=st.session_state.interview_history, 
-                        target_role=job_context.get('title', 'AI Engineer'),
-                        company_name=job_context.get('company', ''),
-                        job_description=job_context.get('description', ''),
-                        resume_context=resume_context,
-                        interview_focus=config.get('focus', 'balanced'),
-                        difficulty=config.get('difficulty', 'medium')
-                    )
-                    
-                    # 3. Save response
-                    st.session_state.interview_history.append({
-                        "role": "assistant", 
-                        "content": ai_response['question'],
-                        "sample_answer": ai_response['sample_answer']
-                    })
-                    
-                    # 4. Generate audio
-                    cleanup_old_audio()
-                    new_path = interviewer.text_to_speech(ai_response['question'])
-                    st.session_state.current_audio_path = new_path
-                    
-                    st.rerun()
-                    
 elif not uploaded_file:
     pass
@@ -3,6 +3,7 @@ Configuration Settings
 Global settings for file paths, scanning parameters, and matching weights
 """
 
+import os
 from pathlib import Path
 
 # ==========================================
@@ -13,6 +14,7 @@ DATA_DIR = BASE_DIR / "data"
 RESUME_DIR = BASE_DIR / "sample_data" / "resumes"
 OUTPUT_DIR = BASE_DIR / "output"
 LOG_DIR = BASE_DIR / "logs"
+CACHE_DIR = BASE_DIR / ".cache"  # Created on demand by utils/cache.py
 
 # Create directories if they don't exist
 for directory in [DATA_DIR, RESUME_DIR, OUTPUT_DIR, LOG_DIR]:
@@ -38,6 +40,19 @@ TOTAL_MAX_JOBS = 30
 # Enable synthetic jobs if scraper results are low
 INCLUDE_SYNTHETIC_JOBS = True
 
+# Resume profile format version; part of every analysis cache key
+ANALYSIS_VERSION = "2.0"
+
+# Gap-analysis output/logic version; bump when analyze_gaps changes to drop cached results
+GAP_ANALYSIS_VERSION = "1.0"
+
+# Groq models for generated documents: fast drafts by default, 70B on request
+DRAFT_LLM_MODEL = "llama-3.1-8b-instant"
+QUALITY_LLM_MODEL = "llama-3.3-70b-versatile"
+
+# CLI cover letters reuse a cached draft for a day; set REGENERATE_LETTERS=1 for fresh ones
+REGENERATE_LETTERS = os.getenv("REGENERATE_LETTERS", "0") == "1"
+
 # User Agent for scraping to avoid blocking
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -3,6 +3,9 @@ from langgraph.graph import StateGraph, END
 from langchain_groq import ChatGroq
 from langchain_community.tools import DuckDuckGoSearchRun
 from langchain_core.prompts import ChatPromptTemplate
+from utils.http_client import get_http_client
+from utils.cache import cached_function
+from config import DRAFT_LLM_MODEL
 
 # 1. Define the State (This stays global as a Type definition)
 class AgentState(TypedDict):
@@ -13,10 +16,43 @@ class AgentState(TypedDict):
     research_data: str
     cover_letter: str
 
+# Writer prompt is parsed once at import and shared by every compiled graph
+_WRITER_PROMPT = ChatPromptTemplate.from_template(
+    """
+    You are an expert career coach. Write a highly personalized cover letter.
+    
+    CANDIDATE PROFILE:
+    {resume_text}
+    
+    JOB DETAILS:
+    Role: {job_title} at {company_name}
+    Description: {job_description}
+    
+    COMPANY RESEARCH (Use this to tailor the intro):
+    {research_data}
+    
+    INSTRUCTIONS:
+    1. Start with a strong hook referencing the company's recent news or values found in the research.
+    2. Connect the candidate's specific skills to the job description.
+    3. Keep it professional, concise, and persuasive.
+    4. Do NOT include placeholders like [Insert Name]. Use the data provided.
+    """
+)
+
+def needs_research(state: AgentState) -> bool:
+    """
+    Entry route of the graph, also used by the UI to label progress.
+    Dork results carry placeholder employers ("LinkedIn Employer"), and searching
+    for those returns nothing about the actual company, so research is skipped.
+    """
+    company = state['company_name'].strip()
+    return bool(company) and not company.endswith(" Employer")
+
 # 2. Builder Function (Lazy Initialization)
-def init_agent_graph(api_key: str):
+def init_agent_graph(api_key: str, model_name: str = DRAFT_LLM_MODEL):
     """
     Initializes the Graph and LLM only when called with a valid API Key.
+    Drafts use the fast 8B model unless a larger `model_name` is requested.
     """
     if not api_key:
         raise ValueError("Groq API Key is missing.")
@@ -24,11 +60,17 @@ def init_agent_graph(api_key: str):
     # Initialize Tools & Model LOCALLY inside the function
     search_tool = DuckDuckGoSearchRun()
     llm = ChatGroq(
-        model_name="llama-3.3-70b-versatile",  # Updated model
+        model_name=model_name,
         temperature=0.7, 
-        api_key=api_key
+        api_key=api_key,
+        http_client=get_http_client()  # Shared keep-alive connection pool
     )
 
+    # Company research changes slowly; reuse it across reruns and restarts for a day
+    @cached_function("research", expire=24 * 3600)
+    def search_company(query: str) -> str:
+        return search_tool.run(query)
+
     # --- NODE 1: THE RESEARCHER ---
     def research_node(state: AgentState):
         print(f"🕵️ Researching {state['company_name']}...")
@@ -38,50 +80,33 @@ def init_agent_graph(api_key: str):
         query = f"recent news mission values work culture of {company}"
         try:
             # Run search
-            results = search_tool.run(query)
+            results = search_company(query)
         except Exception as e:
             results = f"Could not fetch live data. Reason: {str(e)}"
         
         return {"research_data": results}
 
+    # --- ROUTER: skip research when it can't add anything ---
+    def route_start(state: AgentState):
+        return "researcher" if needs_research(state) else "writer"
+
+    # Chain connects prompt -> LLM
+    chain = _WRITER_PROMPT | llm
+
     # --- NODE 2: THE WRITER ---
     def writing_node(state: AgentState):
         print(f"✍️ Drafting letter for {state['job_title']}...")
         
-        prompt_template = ChatPromptTemplate.from_template(
-            """
-            You are an expert career coach. Write a highly personalized cover letter.
-            
-            CANDIDATE PROFILE:
-            {resume_text}
-            
-            JOB DETAILS:
-            Role: {job_title} at {company_name}
-            Description: {job_description}
-            
-            COMPANY RESEARCH (Use this to tailor the intro):
-            {research_data}
-            
-            INSTRUCTIONS:
-            1. Start with a strong hook referencing the company's recent news or values found in the research.
-            2. Connect the candidate's specific skills to the job description.
-            3. Keep it professional, concise, and persuasive.
-            4. Do NOT include placeholders like [Insert Name]. Use the data provided.
-            """
-        )
-        
-        # Chain connects prompt -> LLM
-        chain = prompt_template | llm
-        
-        response = chain.invoke({
+        # Not cached: each "Draft" click should sample a fresh letter (temperature 0.7)
+        letter = chain.invoke({
             "resume_text": state['resume_text'],
             "job_title": state['job_title'],
             "company_name": state['company_name'],
             "job_description": state['job_description'],
             "research_data": state['research_data']
-        })
+        }).content
         
-        return {"cover_letter": response.content}
+        return {"cover_letter": letter}
 
     # 3. Build the Graph
     workflow = StateGraph(AgentState)
@@ -91,7 +116,7 @@ def init_agent_graph(api_key: str):
     workflow.add_node("writer", writing_node)
 
     # Define Edges
-    workflow.set_entry_point("researcher")
+    workflow.set_conditional_entry_point(route_start, {"researcher": "researcher", "writer": "writer"})
     workflow.add_edge("researcher", "writer")
     workflow.add_edge("writer", END)
 
@@ -6,15 +6,26 @@ Auto-adapts tone based on the role and emphasizes 'Problem-Solution' logic.
 
 import os
 import re
-from typing import Dict, List, Any
+import asyncio
+import functools
+from typing import Dict, List, Any, Union
 from utils.logger import logger
+from utils.cache import cached_method
 
 try:
     from groq import Groq
+    from utils.http_client import get_http_client
     GROQ_AVAILABLE = True
 except ImportError:
     GROQ_AVAILABLE = False
 
+# Opening/closing markdown fences, including a language tag like ```text
+_FENCE_RE = re.compile(r'```[a-zA-Z]*')
+
+# Title keywords for _determine_tone (substring match, so "Sr. Analyst/Engineer" still hits)
+_CORPORATE_TITLE_KWS = ('manager', 'director', 'vp', 'executive', 'consultant', 'analyst')
+_STARTUP_TITLE_KWS = ('ninja', 'hacker', 'guru', 'lead', 'senior', 'startup')
+
 class CoverLetterGenerator:
     def __init__(self, api_key: str = None):
         self.api_key = api_key or os.getenv("GROQ_API_KEY")
@@ -23,7 +34,7 @@ class CoverLetterGenerator:
         self.model = "llama-3.3-70b-versatile"
         
         if GROQ_AVAILABLE and self.api_key:
-            self.client = Groq(api_key=self.api_key)
+            self.client = Groq(api_key=self.api_key, http_client=get_http_client())
 
     def _extract_candidate_details(self, profile: Dict) -> Dict:
         """Smart extraction of candidate details."""
@@ -45,21 +56,44 @@ class CoverLetterGenerator:
             'github': contact.get('github', '')
         }
 
-    def _determine_tone(self, job_title: str, company: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _determine_tone(job_title: str, company: str) -> str:
         """
         Heuristic to decide if the letter should be Corporate or Startup-style.
+        Pure in its arguments, so repeated titles in a batch are a cache hit.
         """
         job_lower = job_title.lower()
-        if any(x in job_lower for x in ['manager', 'director', 'vp', 'executive', 'consultant', 'analyst']):
+        if any(x in job_lower for x in _CORPORATE_TITLE_KWS):
             return "Professional, Confident, and Results-Oriented"
-        elif any(x in job_lower for x in ['ninja', 'hacker', 'guru', 'lead', 'senior', 'startup']):
+        elif any(x in job_lower for x in _STARTUP_TITLE_KWS):
             return "Passionate, Innovative, and Direct"
         else:
             return "Professional yet Enthusiastic"
 
-    def generate_cover_letter(self, resume_profile: Dict, job_match: Dict) -> str:
+    # The prompt already encodes every normalized input (name, skills, role, tone),
+    # so it is the cache key; errors raise and are never cached. Drafts are samples,
+    # so they expire after a day and `regenerate` skips the cache entirely
+    @cached_method("letter_drafts", expire=24 * 3600, key_extra=lambda self: self.model)
+    def _complete_cached(self, prompt: str) -> str:
+        return self._complete(prompt)
+
+    def _complete(self, prompt: str) -> str:
+        chat_completion = self.client.chat.completions.create(
+            messages=[
+                {"role": "system", "content": "You are a world-class professional resume writer."},
+                {"role": "user", "content": prompt},
+            ],
+            model=self.model,
+            temperature=0.7, # Balanced creativity
+            max_tokens=600
+        )
+        return chat_completion.choices[0].message.content
+
+    def generate_cover_letter(self, resume_profile: Dict, job_match: Dict, regenerate: bool = False) -> str:
         """
         Generates a highly personalized cover letter.
+        Set `regenerate` to sample a fresh draft instead of reusing a cached one.
         """
         # 1. Context Setup
         job_title = job_match.get('job_title', 'Position')
@@ -123,20 +157,10 @@ class CoverLetterGenerator:
         """
 
         try:
-            chat_completion = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": "You are a world-class professional resume writer."},
-                    {"role": "user", "content": prompt},
-                ],
-                model=self.model,
-                temperature=0.7, # Balanced creativity
-                max_tokens=600
-            )
-            
-            content = chat_completion.choices[0].message.content
+            content = self._complete(prompt) if regenerate else self._complete_cached(prompt)
             
             # Post-process: Remove markdown code blocks if AI added them
-            content = re.sub(r'```.*?', '', content, flags=re.DOTALL).strip()
+            content = _FENCE_RE.sub('', content).strip()
             
             # Add header/footer if AI didn't provide them nicely
             final_letter = f"""
@@ -162,6 +186,29 @@ Sincerely,
             logger.error(f"GenAI Error: {e}")
             return self._fallback_template(candidate, job_title, company, skills_str)
 
+    async def _generate_batch_async(self, resume_profile: Dict, job_matches: List[Dict],
+                                    max_workers: int, regenerate: bool) -> List[Union[str, Exception]]:
+        """Drafts letters concurrently; the semaphore caps in-flight Groq requests."""
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def _bounded(match: Dict) -> str:
+            async with semaphore:
+                return await asyncio.to_thread(self.generate_cover_letter, resume_profile, match, regenerate)
+
+        return await asyncio.gather(*[_bounded(m) for m in job_matches], return_exceptions=True)
+
+    def generate_batch(self, resume_profile: Dict, job_matches: List[Dict], max_workers: int = 5,
+                       regenerate: bool = False) -> List[Union[str, Exception]]:
+        """
+        Generates one letter per match. Each call is a network round-trip, so they run
+        concurrently and total time is about one RTT instead of N. Results keep the order of `job_matches`;
+        a letter that failed is returned as its Exception (not raised) so the others are not lost,
+        and callers must check each item with isinstance.
+        """
+        if not job_matches:
+            return []
+        return list(asyncio.run(self._generate_batch_async(resume_profile, job_matches, max_workers, regenerate)))
+
     def _fallback_template(self, cand: Dict, title: str, company: str, skills: str) -> str:
         """Robust fallback template."""
         return f"""
@@ -4,15 +4,106 @@ Clusters missing skills semantically, categorizes them by domain,
 and calculates a 'Severity Score' for the learning roadmap.
 """
 
+import functools
+import numpy as np
 from typing import Dict, List, Tuple
 from collections import Counter
 from core.semantic_matcher import SemanticMatcher
 from utils.logger import logger
+from utils.cache import cached_method, open_disk_cache
+from config import GAP_ANALYSIS_VERSION
+
+# Numba is optional: the clustering kernel runs as plain Python without it
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def _greedy_cluster(sim: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    Assigns each row to the most similar earlier cluster head, or makes it a new head.
+    Rows must be in priority order (most frequent first). Returns the head index per row.
+    """
+    n = sim.shape[0]
+    assign = np.empty(n, dtype=np.int64)
+    heads = np.empty(n, dtype=np.int64)
+    n_heads = 0
+
+    for i in range(n):
+        best = -1
+        best_score = -2.0
+        for k in range(n_heads):
+            score = sim[i, heads[k]]
+            if score > best_score:
+                best_score = score
+                best = heads[k]
+
+        if best >= 0 and best_score >= threshold:
+            assign[i] = best
+        else:
+            heads[n_heads] = i
+            n_heads += 1
+            assign[i] = i
+
+    return assign
+
+@functools.lru_cache(maxsize=None)
+def _get_category_disk():
+    """Skill-category disk cache, opened on first classification rather than at import."""
+    return open_disk_cache("skill_categories_v1")
 
 class SkillGapAnalyzer:
+    # A skill's domain doesn't change between runs: remember every classification
+    # in-process and (with diskcache) across restarts. Bump the namespace in
+    # _get_category_disk if the category anchors in SemanticMatcher change.
+    _category_memo: Dict[str, str] = {}
+
     def __init__(self):
         self.ai = SemanticMatcher()
+
+    def _classify_categories(self, skills: List[str]) -> Dict[str, List[str]]:
+        """
+        batch_classify_categories with a lookup table in front: only skills never
+        seen before reach the embedding classifier.
+        """
+        if not skills:
+            return {}
+
+        memo, disk = self._category_memo, _get_category_disk()
+        known = {}
+        unknown = []
+        for skill in skills:
+            key = skill.lower()
+            cat = memo.get(key)
+            if cat is None and disk is not None:
+                cat = disk.get(key)
+                if cat is not None:
+                    memo[key] = cat
+            if cat is None:
+                unknown.append(skill)
+            else:
+                known[skill] = cat
+
+        for cat, new_skills in self.ai.batch_classify_categories(unknown).items():
+            for skill in new_skills:
+                known[skill] = memo[skill.lower()] = cat
+                if disk is not None:
+                    disk.set(skill.lower(), cat)
+
+        categorized = {k: [] for k in self.ai.cat_keys}
+        for skill in skills:
+            categorized.setdefault(known[skill], []).append(skill)
+        return categorized
         
+    @cached_method("gaps", version=GAP_ANALYSIS_VERSION)
     def analyze_gaps(self, resume_profile: Dict, match_results: List[Dict]) -> Dict:
         """
         1. Aggregates missing skills from all job matches.
@@ -29,45 +120,41 @@ class SkillGapAnalyzer:
         # We want to map { "Raw Skill Name": count }
         clustered_gaps = {} 
         
-        raw_missing_list = []
+        # Count straight from each match; no intermediate list of every missing skill
+        raw_counts = Counter()
+        count_missing = raw_counts.update
         for match in match_results:
             # We look at 'missing_required' from the job_matcher output
-            raw_missing_list.extend(match.get('skill_match', {}).get('missing_required', []))
-
-        # Optimization: Process most frequent first
-        raw_counts = Counter(raw_missing_list)
+            skill_match = match.get('skill_match')
+            if skill_match:
+                count_missing(skill_match.get('missing_required') or ())
         
         # Canonical Mapping: "ReactJS" -> "React"
         canonical_map = {} 
         
-        for raw_skill, count in raw_counts.most_common():
-            # Check if this raw_skill matches an existing canonical cluster
-            existing_clusters = list(clustered_gaps.keys())
-            
-            # Use strict threshold to avoid merging distinct tools (e.g., Java vs JavaScript)
-            match, score = self.ai.find_best_match(raw_skill, existing_clusters, threshold=0.85)
-            
-            if match:
-                # It's a synonym for an existing cluster
-                clustered_gaps[match] += count
-                canonical_map[raw_skill] = match
-            else:
-                # Create new cluster
-                clustered_gaps[raw_skill] = count
-                canonical_map[raw_skill] = raw_skill
+        # Embed every distinct gap once (most frequent first), then cluster over the similarity matrix
+        # instead of re-encoding the growing cluster list for each skill
+        ordered = raw_counts.most_common()
+        names = [skill for skill, _ in ordered]
+        sim = self.ai.similarity_matrix(names)
+        
+        # Use strict threshold to avoid merging distinct tools (e.g., Java vs JavaScript)
+        heads = _greedy_cluster(sim, 0.85)
+        
+        for (raw_skill, count), head in zip(ordered, heads):
+            canonical = names[head]
+            clustered_gaps[canonical] = clustered_gaps.get(canonical, 0) + count
+            canonical_map[raw_skill] = canonical
 
         # --- STEP 2: Intelligent Categorization ---
         # We classify all unique gap names to understand WHAT kind of gap it is.
         unique_gaps = list(clustered_gaps.keys())
         
         # Batch classification using the vector engine
-        categorized_gaps = self.ai.batch_classify_categories(unique_gaps)
+        categorized_gaps = self._classify_categories(unique_gaps)
         
         # Invert the map: Skill -> Category
-        skill_to_cat = {}
-        for cat, skills in categorized_gaps.items():
-            for s in skills:
-                skill_to_cat[s] = cat
+        skill_to_cat = {s: cat for cat, skills in categorized_gaps.items() for s in skills}
 
         # --- STEP 3: Severity Scoring ---
         # Formula: Frequency * Domain_Weight
@@ -5,6 +5,7 @@ import edge_tts
 import uuid
 import sys
 import nest_asyncio
+from functools import lru_cache
 from gtts import gTTS 
 
 # 1. Apply Nested Async Fix
@@ -19,146 +20,116 @@ if sys.platform == "win32":
 
 try:
     from groq import Groq
+    from utils.http_client import get_http_client
 except ImportError:
     pass
 
-
-class MockInterviewer:
-    def __init__(self, api_key):
-        if not api_key:
-            raise ValueError("API Key missing.")
-        self.client = Groq(api_key=api_key)
-        self.llm_model = "llama-3.3-70b-versatile" 
-        self.stt_model = "whisper-large-v3-turbo"
-
-    def transcribe_audio(self, audio_bytes):
-        try:
-            if hasattr(audio_bytes, 'seek'):
-                audio_bytes.seek(0) 
-                audio_data = audio_bytes.read()
-            else:
-                audio_data = audio_bytes
-
-            transcription = self.client.audio.transcriptions.create(
-                file=("input.wav", audio_data), 
-                model=self.stt_model,
-                response_format="text",
-                language="en" 
-            )
-            return transcription
-        except Exception as e:
-            return f"Error: {e}"
-
-    def get_ai_response(
-        self, 
-        history, 
-        target_role="AI Engineer",
-        company_name="",
-        job_description="",
-        resume_context="",
-        interview_focus="balanced",  # "behavioral", "technical", "balanced"
-        difficulty="medium"  # "entry", "medium", "senior", "staff"
-    ):
-        """
-        Generates context-aware interview questions with difficulty and focus control.
-        
-        Args:
-            history: Conversation history
-            target_role: Job title (e.g., "AI Engineer", "Senior ML Engineer")
-            company_name: Company name for context
-            job_description: Job requirements and description
-            resume_context: Candidate's resume summary
-            interview_focus: "behavioral", "technical", or "balanced"
-            difficulty: "entry", "medium", "senior", "staff"
-        """
-        import json
-        
-        # === DIFFICULTY CONFIGURATIONS ===
-        difficulty_configs = {
-            "entry": {
-                "level": "Entry-Level / Junior",
-                "expectation": "0-2 years experience",
-                "technical_depth": "Focus on fundamentals, basic concepts, and willingness to learn",
-                "behavioral_depth": "Academic projects, internships, learning experiences",
-                "example_technical": "Explain what a neural network is and how backpropagation works",
-                "example_behavioral": "Tell me about a challenging course project and how you overcame obstacles"
-            },
-            "medium": {
-                "level": "Mid-Level",
-                "expectation": "2-5 years experience",
-                "technical_depth": "Practical implementation knowledge, system design basics, debugging skills",
-                "behavioral_depth": "Real-world projects, team collaboration, handling production issues",
-                "example_technical": "How would you debug a model that's overfitting? Walk me through your approach",
-                "example_behavioral": "Describe a time when you had to explain a complex technical concept to non-technical stakeholders"
-            },
-            "senior": {
-                "level": "Senior / Lead",
-                "expectation": "5-10 years experience",
-                "technical_depth": "Architecture decisions, scalability, trade-offs, optimization at scale",
-                "behavioral_depth": "Leadership, mentoring, cross-team collaboration, strategic thinking",
-                "example_technical": "Design a real-time recommendation system serving 10M users with <100ms latency",
-                "example_behavioral": "Tell me about a time you had to make a difficult technical decision that involved trade-offs"
-            },
-            "staff": {
-                "level": "Staff / Principal",
-                "expectation": "10+ years, industry leadership",
-                "technical_depth": "Multi-system architecture, research-level problems, innovation, org-wide impact",
-                "behavioral_depth": "Strategic vision, influencing without authority, technical roadmaps, cross-org leadership",
-                "example_technical": "How would you architect a distributed training system for foundation models across multiple datacenters?",
-                "example_behavioral": "Describe how you've influenced technical direction across multiple teams or an entire organization"
-            }
+# Faster JSON decoding when orjson is installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
+
+
+# Pure in its arguments, so it is cached at module level rather than per instance
+@lru_cache(maxsize=32)
+def _build_system_prompt(
+    target_role,
+    company_name,
+    job_description,
+    resume_context,
+    interview_focus,
+    difficulty
+):
+    """Interviewer system prompt for one (role, job, resume, focus, difficulty) setting."""
+    # === DIFFICULTY CONFIGURATIONS ===
+    difficulty_configs = {
+        "entry": {
+            "level": "Entry-Level / Junior",
+            "expectation": "0-2 years experience",
+            "technical_depth": "Focus on fundamentals, basic concepts, and willingness to learn",
+            "behavioral_depth": "Academic projects, internships, learning experiences",
+            "example_technical": "Explain what a neural network is and how backpropagation works",
+            "example_behavioral": "Tell me about a challenging course project and how you overcame obstacles"
+        },
+        "medium": {
+            "level": "Mid-Level",
+            "expectation": "2-5 years experience",
+            "technical_depth": "Practical implementation knowledge, system design basics, debugging skills",
+            "behavioral_depth": "Real-world projects, team collaboration, handling production issues",
+            "example_technical": "How would you debug a model that's overfitting? Walk me through your approach",
+            "example_behavioral": "Describe a time when you had to explain a complex technical concept to non-technical stakeholders"
+        },
+        "senior": {
+            "level": "Senior / Lead",
+            "expectation": "5-10 years experience",
+            "technical_depth": "Architecture decisions, scalability, trade-offs, optimization at scale",
+            "behavioral_depth": "Leadership, mentoring, cross-team collaboration, strategic thinking",
+            "example_technical": "Design a real-time recommendation system serving 10M users with <100ms latency",
+            "example_behavioral": "Tell me about a time you had to make a difficult technical decision that involved trade-offs"
+        },
+        "staff": {
+            "level": "Staff / Principal",
+            "expectation": "10+ years, industry leadership",
+            "technical_depth": "Multi-system architecture, research-level problems, innovation, org-wide impact",
+            "behavioral_depth": "Strategic vision, influencing without authority, technical roadmaps, cross-org leadership",
+            "example_technical": "How would you architect a distributed training system for foundation models across multiple datacenters?",
+            "example_behavioral": "Describe how you've influenced technical direction across multiple teams or an entire organization"
         }
-        
-        # === FOCUS CONFIGURATIONS ===
-        focus_configs = {
-            "behavioral": {
-                "ratio": "80% Behavioral / 20% Technical",
-                "emphasis": "Leadership, teamwork, conflict resolution, communication, growth mindset",
-                "structure": "Use STAR method (Situation, Task, Action, Result) for all answers",
-                "topics": [
-                    "Leadership and influence",
-                    "Conflict resolution",
-                    "Project management",
-                    "Communication with stakeholders",
-                    "Learning from failure",
-                    "Team collaboration",
-                    "Prioritization and time management"
-                ]
-            },
-            "technical": {
-                "ratio": "90% Technical / 10% Behavioral",
-                "emphasis": "Deep technical knowledge, problem-solving, system design, algorithms",
-                "structure": "Expect code-level discussions, architecture diagrams, complexity analysis",
-                "topics": [
-                    "ML algorithms and theory",
-                    "System design and architecture",
-                    "Code optimization and debugging",
-                    "Data structures and algorithms",
-                    "MLOps and deployment",
-                    "Model evaluation and metrics",
-                    "Real-world problem solving"
-                ]
-            },
-            "balanced": {
-                "ratio": "50% Technical / 50% Behavioral",
-                "emphasis": "Holistic evaluation of both technical skills and soft skills",
-                "structure": "Alternate between technical deep-dives and behavioral questions",
-                "topics": [
-                    "Technical problem-solving with team context",
-                    "Project delivery with technical challenges",
-                    "Communication of technical concepts",
-                    "Leadership in technical initiatives",
-                    "Learning and adapting to new technologies"
-                ]
-            }
+    }
+    
+    # === FOCUS CONFIGURATIONS ===
+    focus_configs = {
+        "behavioral": {
+            "ratio": "80% Behavioral / 20% Technical",
+            "emphasis": "Leadership, teamwork, conflict resolution, communication, growth mindset",
+            "structure": "Use STAR method (Situation, Task, Action, Result) for all answers",
+            "topics": [
+                "Leadership and influence",
+                "Conflict resolution",
+                "Project management",
+                "Communication with stakeholders",
+                "Learning from failure",
+                "Team collaboration",
+                "Prioritization and time management"
+            ]
+        },
+        "technical": {
+            "ratio": "90% Technical / 10% Behavioral",
+            "emphasis": "Deep technical knowledge, problem-solving, system design, algorithms",
+            "structure": "Expect code-level discussions, architecture diagrams, complexity analysis",
+            "topics": [
+                "ML algorithms and theory",
+                "System design and architecture",
+                "Code optimization and debugging",
+                "Data structures and algorithms",
+                "MLOps and deployment",
+                "Model evaluation and metrics",
+                "Real-world problem solving"
+            ]
+        },
+        "balanced": {
+            "ratio": "50% Technical / 50% Behavioral",
+            "emphasis": "Holistic evaluation of both technical skills and soft skills",
+            "structure": "Alternate between technical deep-dives and behavioral questions",
+            "topics": [
+                "Technical problem-solving with team context",
+                "Project delivery with technical challenges",
+                "Communication of technical concepts",
+                "Leadership in technical initiatives",
+                "Learning and adapting to new technologies"
+            ]
         }
-        
-        # Get configurations
-        diff_config = difficulty_configs.get(difficulty, difficulty_configs["medium"])
-        focus_config = focus_configs.get(interview_focus, focus_configs["balanced"])
-        
-        # === AI ENGINEER SPECIFIC KNOWLEDGE BASE ===
-        ai_engineer_domains = """
+    }
+    
+    # Get configurations
+    diff_config = difficulty_configs.get(difficulty, difficulty_configs["medium"])
+    focus_config = focus_configs.get(interview_focus, focus_configs["balanced"])
+    
+    # === AI ENGINEER SPECIFIC KNOWLEDGE BASE ===
+    ai_engineer_domains = """
 **AI ENGINEER CORE COMPETENCIES:**
 
 1. **Machine Learning Fundamentals**
@@ -209,13 +180,13 @@ class MockInterviewer:
    - Caching strategies
    - Scalability and latency trade-offs
 """
-        
-        # === CONSTRUCT SYSTEM PROMPT ===
-        job_context = f"**Position**: {target_role}"
-        if company_name:
-            job_context += f" at {company_name}"
-        
-        system_content = f"""You are a world-class technical interviewer conducting a {diff_config['level']} interview for:
+    
+    # === CONSTRUCT SYSTEM PROMPT ===
+    job_context = f"**Position**: {target_role}"
+    if company_name:
+        job_context += f" at {company_name}"
+    
+    system_content = f"""You are a world-class technical interviewer conducting a {diff_config['level']} interview for:
 
 {job_context}
 
@@ -307,6 +278,63 @@ Now, analyze the conversation history and generate the NEXT question that:
 3. Tests competencies from the AI Engineer domain
 4. Feels like a real interview with {company_name if company_name else "a top tech company"}
 """
+    return system_content
+
+
+class MockInterviewer:
+    def __init__(self, api_key):
+        if not api_key:
+            raise ValueError("API Key missing.")
+        self.client = Groq(api_key=api_key, http_client=get_http_client())
+        self.llm_model = "llama-3.3-70b-versatile" 
+        self.stt_model = "whisper-large-v3-turbo"
+
+    def transcribe_audio(self, audio_bytes):
+        try:
+            # Hand the stream itself to the client so the recording is uploaded
+            # from the buffer instead of being copied into a new bytes object
+            if hasattr(audio_bytes, 'seek'):
+                audio_bytes.seek(0) 
+            audio_data = audio_bytes
+
+            transcription = self.client.audio.transcriptions.create(
+                file=("input.wav", audio_data), 
+                model=self.stt_model,
+                response_format="text",
+                language="en" 
+            )
+            return transcription
+        except Exception as e:
+            return f"Error: {e}"
+
+    def get_ai_response(
+        self, 
+        history, 
+        target_role="AI Engineer",
+        company_name="",
+        job_description="",
+        resume_context="",
+        interview_focus="balanced",  # "behavioral", "technical", "balanced"
+        difficulty="medium"  # "entry", "medium", "senior", "staff"
+    ):
+        """
+        Generates context-aware interview questions with difficulty and focus control.
+        
+        Args:
+            history: Conversation history
+            target_role: Job title (e.g., "AI Engineer", "Senior ML Engineer")
+            company_name: Company name for context
+            job_description: Job requirements and description
+            resume_context: Candidate's resume summary
+            interview_focus: "behavioral", "technical", or "balanced"
+            difficulty: "entry", "medium", "senior", "staff"
+        """
+        # The system prompt only depends on the session settings, so it is built
+        # once per interview and sent byte-identical every turn
+        system_content = _build_system_prompt(
+            target_role, company_name, job_description,
+            resume_context, interview_focus, difficulty
+        )
         
         messages = [{"role": "system", "content": system_content}]
         for msg in history:
@@ -320,7 +348,7 @@ Now, analyze the conversation history and generate the NEXT question that:
                 max_tokens=1200,
                 temperature=0.7
             )
-            response_dict = json.loads(completion.choices[0].message.content)
+            response_dict = _json_loads(completion.choices[0].message.content)
             
             # Validate
             if "question" not in response_dict or "sample_answer" not in response_dict:
@@ -15,13 +15,8 @@ class IntelligentJobMatcher:
         # Weights for the final score
         self.weights = {'skills': 0.8, 'experience': 0.2}
 
-    def extract_job_requirements(self, job_desc: str, job_title: str) -> Dict:
-        """
-        Extracts requirements dynamically using AI validation.
-        UPDATED: Uses Batch Processing for speed.
-        """
-        # 1. Extract potential technical nouns (Heuristic Regex)
-        # We look for Capitalized words or special tech terms like C++, .NET
+    def _extract_candidates(self, job_desc: str) -> List[str]:
+        """Heuristic pass: capitalized words and special tech terms like C++, .NET"""
         candidates = set(re.findall(
             r'\b[A-Z][a-zA-Z0-9+#]*\b|\b\.NET\b|\bNode\.js\b', 
             job_desc
@@ -37,10 +32,18 @@ class IntelligentJobMatcher:
             "Global", "Local", "Business", "Client", "Service", "Solution"
         }
         
-        filtered_candidates = [
+        return [
             c for c in candidates 
             if len(c) > 1 and c not in stopwords and not c.isdigit()
         ]
+
+    def extract_job_requirements(self, job_desc: str, job_title: str) -> Dict:
+        """
+        Extracts requirements dynamically using AI validation.
+        UPDATED: Uses Batch Processing for speed.
+        """
+        # 1. Extract potential technical nouns (Heuristic Regex)
+        filtered_candidates = self._extract_candidates(job_desc)
         
         # 2. AI VALIDATION (The Fix: Using Batch Processing)
         # Instead of calling .is_technical_skill() in a loop, we filter all at once.
@@ -75,11 +78,8 @@ class IntelligentJobMatcher:
         else:
             return "Critical"
 
-    def calculate_skill_match(self, resume_profile: Dict, job_req: Dict) -> Dict:
-        """
-        Matches Resume Skills (Flattened) vs Job Requirements using Semantic AI.
-        """
-        # Flatten resume skills into a single list
+    def _flatten_resume_skills(self, resume_profile: Dict) -> List[str]:
+        """Flatten resume skills into a single list"""
         resume_skill_list = []
         for cat, skills in resume_profile.get('skills_by_category', {}).items():
             for s in skills:
@@ -88,6 +88,18 @@ class IntelligentJobMatcher:
                     resume_skill_list.append(s.get('skill', ''))
                 else:
                     resume_skill_list.append(str(s))
+        return resume_skill_list
+
+    def calculate_skill_match(self, resume_profile: Dict, job_req: Dict,
+                              best_matches: Dict = None, resume_skill_list: List[str] = None) -> Dict:
+        """
+        Matches Resume Skills (Flattened) vs Job Requirements using Semantic AI.
+        `best_matches` holds precomputed {req: (match, score)} lookups and
+        `resume_skill_list` the flattened resume skills, both prepared once by batch_match.
+        """
+        if resume_skill_list is None:
+            resume_skill_list = self._flatten_resume_skills(resume_profile)
+        resume_lower = {r.lower() for r in resume_skill_list}
         
         matched = []
         missing = []
@@ -109,14 +121,17 @@ class IntelligentJobMatcher:
         for req in required:
             # 1. Try Exact Match (Fastest)
             # Case-insensitive check
-            if any(req.lower() == r.lower() for r in resume_skill_list):
+            if req.lower() in resume_lower:
                 matched.append({'skill': req, 'method': 'Exact'})
                 continue
                 
             # 2. Try AI Semantic Match (Slower but Smarter)
             # Note: Since find_best_match is a semantic operation, we keep it here.
             # (It's 1-to-N comparison, which is fast enough for ~50 resume skills)
-            best_match, score = self.ai.find_best_match(req, resume_skill_list, threshold=0.70)
+            if best_matches is not None:
+                best_match, score = best_matches.get(req, (None, 0.0))
+            else:
+                best_match, score = self.ai.find_best_match(req, resume_skill_list, threshold=0.70)
             
             if best_match:
                 matched.append({'skill': req, 'method': 'AI', 'matched_with': best_match})
@@ -219,7 +234,20 @@ class IntelligentJobMatcher:
         # 2. Calculate Skill Match
         skill_res = self.calculate_skill_match(resume_profile, job_reqs)
         
-        # 3. Calculate Experience Match
+        # 3. Semantic Title Match 
+        career_level = resume_profile.get('career_level', 'Mid-Level')
+        candidate_title_proxy = f"{career_level} Developer"
+        title_sim = self.ai.get_similarity(job_title, candidate_title_proxy)
+        
+        return self._build_match_result(resume_profile, job, skill_res, title_sim)
+
+    def _build_match_result(self, resume_profile: Dict, job: Dict,
+                            skill_res: Dict, title_sim: float) -> Dict:
+        """Combines skill, experience and title signals into the final match record."""
+        job_desc = job.get('description', '')
+        job_title = job.get('title', '')
+        
+        # 4. Calculate Experience Match
         # Safe get for nested dicts
         exp_data = resume_profile.get('experience', {})
         if isinstance(exp_data, dict):
@@ -229,11 +257,6 @@ class IntelligentJobMatcher:
             
         exp_res = self.calculate_experience_match(resume_years, job_desc)
         
-        # 4. Semantic Title Match 
-        career_level = resume_profile.get('career_level', 'Mid-Level')
-        candidate_title_proxy = f"{career_level} Developer"
-        title_sim = self.ai.get_similarity(job_title, candidate_title_proxy)
-        
         # 5. Final Weighted Score
         final_score = (skill_res['score'] * 0.6) + (title_sim * 0.2) + (exp_res['score'] * 0.2)
         
@@ -275,4 +298,50 @@ class IntelligentJobMatcher:
             'action_items': action_items,
             # IMPORTANT: Pass raw data for the Resume Tailor feature
             'raw_text': job_desc 
-        }
\ No newline at end of file
+        }
+
+    def batch_match(self, resume_profile: Dict, jobs: List[Dict]) -> List[Dict]:
+        """
+        Scores all jobs with one encode pass per stage instead of one per job:
+        requirement filtering, requirement-to-resume matching and title similarity
+        are each vectorized across the whole job list. Results keep the order of `jobs`.
+        """
+        if not jobs:
+            return []
+        
+        # 1. Requirement extraction: filter the union of candidates once
+        job_candidates = [self._extract_candidates(job.get('description', '')) for job in jobs]
+        unique_candidates = list(dict.fromkeys(c for cands in job_candidates for c in cands))
+        valid = set(self.ai.batch_filter_skills(unique_candidates, threshold=0.45))
+        job_reqs = [
+            {
+                'required_skills': [c for c in cands if c in valid],
+                'job_title_features': job.get('title', '').lower().split()
+            }
+            for job, cands in zip(jobs, job_candidates)
+        ]
+        
+        # 2. Semantic skill matching: one similarity matrix for every requirement
+        # that has no exact (case-insensitive) match in the resume
+        resume_skill_list = self._flatten_resume_skills(resume_profile)
+        resume_lower = {r.lower() for r in resume_skill_list}
+        pending = list(dict.fromkeys(
+            req for reqs in job_reqs for req in reqs['required_skills']
+            if req.lower() not in resume_lower
+        ))
+        best_matches = self.ai.batch_find_best_match(pending, resume_skill_list, threshold=0.70)
+        
+        # 3. Title similarity for all jobs at once
+        career_level = resume_profile.get('career_level', 'Mid-Level')
+        title_sims = self.ai.batch_similarity(
+            [job.get('title', '') for job in jobs], f"{career_level} Developer"
+        )
+        
+        return [
+            self._build_match_result(
+                resume_profile, job,
+                self.calculate_skill_match(resume_profile, reqs, best_matches, resume_skill_list),
+                title_sim
+            )
+            for job, reqs, title_sim in zip(jobs, job_reqs, title_sims)
+        ]
@@ -6,12 +6,17 @@ Why? Direct scraping is blocked. RSS is dead. Search Engines are the only open d
 
 import time
 import random
+import asyncio
 import requests
 import warnings
 from typing import List, Dict
 from utils.logger import logger
+from utils.cache import cached_method
 from config import USER_AGENT, INCLUDE_SYNTHETIC_JOBS
 
+# Sources share one DuckDuckGo rate limit; more parallel dorks than this get throttled
+MAX_CONCURRENT_DORKS = 2
+
 # Suppress warnings
 warnings.filterwarnings("ignore", category=RuntimeWarning, module="duckduckgo_search")
 
@@ -41,42 +46,48 @@ class MultiSourceJobScraper:
         logger.info(f"  🔎 Dorking {source_name} via DuckDuckGo...")
         jobs = []
         
-        for keyword in keywords:
-            try:
-                # Broad search query: site:jobstreet.com.my "data scientist" malaysia
-                query = f'site:{site_domain} "{keyword}" {location}'
-                
-                with DDGS() as ddgs:
-                    # Get top results
-                    results = list(ddgs.text(query, max_results=6))
+        # One DDGS session per source, reused across keywords
+        try:
+            with DDGS() as ddgs:
+                for i, keyword in enumerate(keywords):
+                    # Sleep between queries to prevent DDG rate limiting (not before the first)
+                    if i:
+                        time.sleep(random.uniform(2.0, 4.0))
                 
-                for res in results:
-                    title = res.get('title', 'Unknown Job')
-                    link = res.get('href', '')
-                    body = res.get('body', '')
+                    try:
+                        # Broad search query: site:jobstreet.com.my "data scientist" malaysia
+                        query = f'site:{site_domain} "{keyword}" {location}'
                     
-                    # Skip non-job pages (e.g., login pages, category listings)
-                    if "login" in link or "signup" in link or "category" in link:
-                        continue
+                        # Get top results
+                        results = list(ddgs.text(query, max_results=6))
+                    
+                        for res in results:
+                            title = res.get('title', 'Unknown Job')
+                            link = res.get('href', '')
+                            body = res.get('body', '')
+                        
+                            # Skip non-job pages (e.g., login pages, category listings)
+                            if "login" in link or "signup" in link or "category" in link:
+                                continue
+                            
+                            # Basic Cleanup
+                            clean_title = title.split(" | ")[0].split(" - ")[0].strip()
                         
-                    # Basic Cleanup
-                    clean_title = title.split(" | ")[0].split(" - ")[0].strip()
+                            jobs.append({
+                                'title': clean_title,
+                                'company': f"{source_name} Employer", # Hard to extract without visiting
+                                'location': location,
+                                'description': body, # Search snippet often contains requirements
+                                'url': link,
+                                'source': f"{source_name} (Dork)",
+                                'posted_date': 'Recent'
+                            })
                     
-                    jobs.append({
-                        'title': clean_title,
-                        'company': f"{source_name} Employer", # Hard to extract without visiting
-                        'location': location,
-                        'description': body, # Search snippet often contains requirements
-                        'url': link,
-                        'source': f"{source_name} (Dork)",
-                        'posted_date': 'Recent'
-                    })
-                
-                # Sleep to prevent DDG rate limiting
-                time.sleep(random.uniform(2.0, 4.0))
-                
-            except Exception:
-                continue
+                    except Exception as e:
+                        logger.warning(f"    DuckDuckGo query failed on {source_name} for '{keyword}': {e}")
+                        continue
+        except Exception as e:
+            logger.warning(f"    DuckDuckGo session failed for {source_name}: {e}")
         
         logger.info(f"    -> Found {len(jobs)} potential jobs on {source_name}")
         return jobs
@@ -116,19 +127,52 @@ class MultiSourceJobScraper:
             })
         return jobs
 
-    def search_all_sources(self, keywords: List[str], location: str = "Malaysia", max_jobs: int = 30) -> List[Dict]:
-        """Master Search Aggregator"""
-        all_jobs = []
-        
-        # Run Dorking on all major platforms
-        all_jobs.extend(self.search_linkedin_via_dork(keywords, location))
-        all_jobs.extend(self.search_jobstreet_via_dork(keywords, location))
-        all_jobs.extend(self.search_indeed_via_dork(keywords, location))
-        all_jobs.extend(self.search_glassdoor_via_dork(keywords, location))
+    async def _search_sources_async(self, keywords: List[str], location: str) -> List[Dict]:
+        """
+        Fans out to the platforms, at most MAX_CONCURRENT_DORKS at a time. Each
+        dork still sleeps between its own queries, so DuckDuckGo sees a bounded
+        request rate while the network waits of two sources overlap.
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_DORKS)
+
+        async def _bounded(search):
+            async with semaphore:
+                return await asyncio.to_thread(search, keywords, location)
+
+        sources = [
+            self.search_linkedin_via_dork,
+            self.search_jobstreet_via_dork,
+            self.search_indeed_via_dork,
+            self.search_glassdoor_via_dork,
+        ]
+        results = await asyncio.gather(
+            *[_bounded(search) for search in sources]
+        )
+        return [job for source_jobs in results for job in source_jobs]
+
+    @cached_method("jobs", expire=1800)  # Listings go stale; refresh every 30 min
+    def _scrape_real_sources(self, keywords: List[str], location: str) -> List[Dict]:
+        """
+        Deduplicated listings from the dork sources. Raises LookupError when none came
+        back, so an outage is never cached and the next search tries the network again.
+        """
+        # Run Dorking on all major platforms, two at a time
+        all_jobs = asyncio.run(self._search_sources_async(keywords, location))
         
         # Deduplicate
         unique = {j['url']: j for j in all_jobs}.values()
         final_list = list(unique)
+        if not final_list:
+            raise LookupError("No listings from any source")
+        return final_list
+
+    def search_all_sources(self, keywords: List[str], location: str = "Malaysia", max_jobs: int = 30) -> List[Dict]:
+        """Master Search Aggregator"""
+        # Only real listings are cached; the synthetic fallback is rebuilt per call
+        try:
+            final_list = self._scrape_real_sources(keywords, location)
+        except LookupError:
+            final_list = []
         
         logger.info(f"✓ Found {len(final_list)} jobs from real-world sources.")
         
@@ -11,14 +11,23 @@ from typing import Dict, List, Any, Union
 from urllib.parse import quote_plus
 from core.semantic_matcher import SemanticMatcher
 from utils.logger import logger
+from utils.cache import cached_method
 
 # Try importing Groq
 try:
     from groq import Groq
+    from utils.http_client import get_http_client
     GROQ_AVAILABLE = True
 except ImportError:
     GROQ_AVAILABLE = False
 
+# Faster JSON decoding when orjson is installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 class LearningRoadmapGenerator:
     def __init__(self, api_key: str = None):
         self.semantic_ai = SemanticMatcher() 
@@ -29,7 +38,7 @@ class LearningRoadmapGenerator:
         self.model = "llama-3.3-70b-versatile" 
         
         if GROQ_AVAILABLE and self.api_key:
-            self.client = Groq(api_key=self.api_key)
+            self.client = Groq(api_key=self.api_key, http_client=get_http_client())
 
     def _generate_search_links(self, skill: str, category: str) -> List[Dict]:
         """
@@ -122,6 +131,20 @@ class LearningRoadmapGenerator:
                 'timeline': {}
             }
 
+        try:
+            return self._ai_roadmap(target_skills, current_level, experience_years, current_skills[:25])
+        except Exception as e:
+            logger.error(f"GenAI Roadmap Failed: {e}")
+            return {
+                'career_focus': "Standard Path",
+                'detailed_resources': self._get_fallback_roadmap(target_skills)
+            }
+
+    # Only successful AI roadmaps reach the cache; errors raise to the caller's fallback
+    @cached_method("roadmap", key_extra=lambda self: self.model)
+    def _ai_roadmap(self, target_skills: List[str], current_level: str,
+                    experience_years: Any, known_skills: List[str]) -> Dict:
+        """Asks the LLM for a transfer-learning plan and attaches the search links."""
         # --- THE INTELLIGENT PROMPT ---
         system_prompt = (
             "You are an expert Technical Career Coach. "
@@ -134,7 +157,7 @@ class LearningRoadmapGenerator:
         user_prompt = f"""
         **Candidate Profile:**
         - Current Level: {current_level} ({experience_years} years exp)
-        - Known Skills: {', '.join(current_skills[:25])}
+        - Known Skills: {', '.join(known_skills)}
         
         **Target Skills to Learn:**
         {', '.join(target_skills)}
@@ -156,48 +179,40 @@ class LearningRoadmapGenerator:
         }}
         """
 
-        try:
-            completion = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                model=self.model,
-                response_format={"type": "json_object"}, # Enforces JSON structure
-                temperature=0.4,
-                max_tokens=2048
-            )
-            
-            response_text = completion.choices[0].message.content
-            ai_data = json.loads(response_text)
-            ai_roadmap = ai_data.get('roadmap', [])
+        completion = self.client.chat.completions.create(
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            model=self.model,
+            response_format={"type": "json_object"}, # Enforces JSON structure
+            temperature=0.4,
+            max_tokens=2048
+        )
+        
+        response_text = completion.choices[0].message.content
+        ai_data = _json_loads(response_text)
+        ai_roadmap = ai_data.get('roadmap', [])
+        
+        # Post-process: Add static links to the AI's wisdom
+        final_resources = []
+        for item in ai_roadmap:
+            skill_name = item.get('skill', 'Unknown')
             
-            # Post-process: Add static links to the AI's wisdom
-            final_resources = []
-            for item in ai_roadmap:
-                skill_name = item.get('skill', 'Unknown')
-                
-                # Double-check category locally for accurate linking
-                cat = self.semantic_ai.classify_category(skill_name)
-                
-                # Merge AI wisdom with Deterministic Links
-                item['category'] = cat
-                item['online_courses'] = self._generate_search_links(skill_name, cat)
-                final_resources.append(item)
+            # Double-check category locally for accurate linking
+            cat = self.semantic_ai.classify_category(skill_name)
             
-            # Sort by difficulty for the timeline
-            difficulty_order = {"Low": 1, "Medium": 2, "High": 3}
-            final_resources.sort(key=lambda x: difficulty_order.get(x.get('difficulty', 'Medium'), 2))
-
-            return {
-                'career_focus': f"Transition to {current_level}+ Role",
-                'detailed_resources': final_resources,
-                'total_skills': len(target_skills)
-            }
+            # Merge AI wisdom with Deterministic Links
+            item['category'] = cat
+            item['online_courses'] = self._generate_search_links(skill_name, cat)
+            final_resources.append(item)
+        
+        # Sort by difficulty for the timeline
+        difficulty_order = {"Low": 1, "Medium": 2, "High": 3}
+        final_resources.sort(key=lambda x: difficulty_order.get(x.get('difficulty', 'Medium'), 2))
 
-        except Exception as e:
-            logger.error(f"GenAI Roadmap Failed: {e}")
-            return {
-                'career_focus': "Standard Path",
-                'detailed_resources': self._get_fallback_roadmap(target_skills)
-            }
\ No newline at end of file
+        return {
+            'career_focus': f"Transition to {current_level}+ Role",
+            'detailed_resources': final_resources,
+            'total_skills': len(target_skills)
+        }
@@ -10,9 +10,14 @@ from datetime import datetime
 from collections import Counter
 from utils.logger import logger
 from core.semantic_matcher import SemanticMatcher
+from utils.cache import cached_method
+from config import ANALYSIS_VERSION
 
 
 class UltraIntelligentResumeAnalyzer:
+    # Part of the cache key: bump config.ANALYSIS_VERSION when the profile format changes
+    ANALYSIS_VERSION = ANALYSIS_VERSION
+
     def __init__(self):
         self.ai = SemanticMatcher()
         
@@ -477,6 +482,7 @@ class UltraIntelligentResumeAnalyzer:
         
         return recommendations
 
+    @cached_method("analyzer", version=ANALYSIS_VERSION)
     def analyze_resume(self, text: str) -> Dict:
         """
         Main Entry Point - Comprehensive Resume Analysis
@@ -526,7 +532,7 @@ class UltraIntelligentResumeAnalyzer:
             
             # Metadata
             'analysis_timestamp': datetime.now().isoformat(),
-            'analysis_version': '2.0'
+            'analysis_version': self.ANALYSIS_VERSION
         }
         
         logger.info("✅ Resume analysis complete!")
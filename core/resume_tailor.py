@@ -5,43 +5,65 @@ Uses Llama 3.3 to perform ATS Optimization, Keyword Injection, and STAR-method r
 
 import json
 import re
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Optional
 from langchain_groq import ChatGroq
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.outputs import Generation
 from utils.logger import logger
+from utils.http_client import get_http_client
+from config import DRAFT_LLM_MODEL
+
+# orjson emits the profile JSON faster; decode since the prompt needs a str
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj, default=str).decode('utf-8')
+except ImportError:
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, default=str)
+
+# Streamed replies are re-parsed for on_partial only after this many new characters
+_PARTIAL_PARSE_EVERY = 256
+
+# Fenced payload: ```json ... ``` (language tag optional)
+_FENCE_RE = re.compile(r"^\s*```[a-zA-Z]*\s*(.*?)\s*```\s*$", re.DOTALL)
 
 def clean_json_string(json_str: str) -> str:
     """
     Cleans LLM output to ensure valid JSON parsing.
     Removes Markdown code blocks (```json ... ```).
     """
-    cleaned = json_str.strip()
-    # Remove markdown code blocks if present
-    if cleaned.startswith("```"):
-        # Split by newline to remove the first line (```json) and the last line (```)
-        parts = cleaned.split("\n")
-        if len(parts) > 2:
-            cleaned = "\n".join(parts[1:-1])
-    return cleaned
-
-def tailor_resume(profile: Dict[str, Any], job_description: str, api_key: str) -> Dict[str, Any]:
+    m = _FENCE_RE.match(json_str)
+    return m.group(1) if m else json_str.strip()
+
+def tailor_resume(profile: Dict[str, Any], job_description: str, api_key: str,
+                  on_partial: Optional[Callable[[Dict[str, Any]], None]] = None,
+                  model_name: str = DRAFT_LLM_MODEL) -> Dict[str, Any]:
     """
     Orchestrates the AI tailoring process.
     1. Analyzing JD for High-Value Keywords.
     2. Rewriting Summary to be a "Hook".
     3. Transforming Bullet points into STAR format.
     4. Re-sorting Skills by relevance.
+
+    If `on_partial` is given, the response is streamed and the callback receives
+    each partially parsed JSON object as it grows. `model_name` defaults to the
+    fast draft model; pass config.QUALITY_LLM_MODEL for a slower, stronger rewrite.
+
+    Raises RuntimeError when the LLM call fails or its reply is not valid JSON.
     """
     if not api_key:
         raise ValueError("API Key missing.")
 
-    # ✅ CONFIG: Use Llama 3.3 70B for maximum reasoning capability
+    # ✅ CONFIG: 8B instant drafts by default; 70B when the caller asks for quality
     llm = ChatGroq(
-        model_name="llama-3.3-70b-versatile", 
+        model_name=model_name, 
         temperature=0.4, # Low temperature for reliable formatting
         api_key=api_key,
-        max_tokens=4096
+        max_tokens=4096,
+        http_client=get_http_client()  # Reuse the pooled connection across calls
     )
 
     parser = JsonOutputParser()
@@ -88,17 +110,40 @@ def tailor_resume(profile: Dict[str, Any], job_description: str, api_key: str) -
     # Convert profile dict to string for the prompt context
     # We remove 'analysis_timestamp' or internal metadata to save tokens if needed
     clean_profile = {k: v for k, v in profile.items() if k not in ['analysis_timestamp', 'matches']}
-    profile_str = json.dumps(clean_profile)
+    profile_str = _json_dumps(clean_profile)
 
     logger.info("  🎨 AI Tailoring Resume for target role...")
 
     try:
-        # Invoke the chain
-        tailored_json = chain.invoke({
+        inputs = {
             "job_description": job_description,
             "profile_json": profile_str,
             "format_instructions": parser.get_format_instructions()
-        })
+        }
+        if on_partial is None:
+            tailored_json = chain.invoke(inputs)
+        else:
+            # Stream raw text for progress, then parse the complete reply strictly so a
+            # truncated or invalid response falls back instead of returning a partial dict
+            # Each partial parse re-reads the whole text, so it runs every
+            # _PARTIAL_PARSE_EVERY characters rather than on every token
+            parts = []
+            received = parsed_at = 0
+            last_partial = None
+            for chunk in (prompt | llm).stream(inputs):
+                parts.append(chunk.content)
+                received += len(chunk.content)
+                if received - parsed_at < _PARTIAL_PARSE_EVERY:
+                    continue
+                parsed_at = received
+                raw_text = "".join(parts)
+                partial = parser.parse_result([Generation(text=raw_text)], partial=True)
+                if isinstance(partial, dict) and partial != last_partial:
+                    last_partial = partial
+                    on_partial(partial)
+            raw_text = "".join(parts)
+            # Same strict parse as the invoke path; a truncated reply raises here
+            tailored_json = parser.parse(raw_text)
         
         # ✅ POST-PROCESSING RELIABILITY CHECK
         # Ensure critical keys exist; if AI missed them, copy from original
@@ -116,5 +161,5 @@ def tailor_resume(profile: Dict[str, Any], job_description: str, api_key: str) -
 
     except Exception as e:
         logger.error(f"❌ Resume Tailoring Failed: {e}")
-        # FAIL-SAFE: Return the original profile so the app doesn't crash
-        return profile
\ No newline at end of file
+        # Raised, so the caller can tell a rewrite from the untouched original
+        raise RuntimeError(f"Resume tailoring failed: {e}") from e
\ No newline at end of file
@@ -95,6 +95,49 @@ class SemanticMatcher:
             
         return None, 0.0
 
+    # 🚀 BATCH METHOD: Best Match for many queries
+    def batch_find_best_match(self, queries: List[str], options: List[str],
+                              threshold: float = 0.65) -> Dict[str, Tuple[Union[str, None], float]]:
+        """
+        Vectorized find_best_match: scores every query against every option in one matrix.
+        Returns {query: (best_option or None, score)}.
+        """
+        if not queries or not options:
+            return {q: (None, 0.0) for q in queries}
+
+        query_embs = self.model.encode(queries, convert_to_tensor=True)
+        option_embs = self.model.encode(options, convert_to_tensor=True)
+
+        scores = util.pytorch_cos_sim(query_embs, option_embs)
+        best_scores, best_indices = torch.max(scores, dim=1)
+
+        results = {}
+        for i, query in enumerate(queries):
+            best_score = float(best_scores[i])
+            if best_score >= threshold:
+                results[query] = (options[best_indices[i].item()], best_score)
+            else:
+                results[query] = (None, 0.0)
+        return results
+
+    # 🚀 BATCH METHOD: Similarity to one reference
+    def batch_similarity(self, texts: List[str], reference: str) -> List[float]:
+        """Similarity of each text to a single reference, from one encode pass."""
+        if not texts:
+            return []
+
+        embs = self.model.encode(texts + [reference], convert_to_tensor=True)
+        return util.pytorch_cos_sim(embs[:-1], embs[-1:])[:, 0].tolist()
+
+    # 🚀 BATCH METHOD: Pairwise Similarity
+    def similarity_matrix(self, texts: List[str]) -> np.ndarray:
+        """All-pairs cosine similarity of `texts` as a float32 (N x N) array."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        embs = self.model.encode(texts, convert_to_tensor=True)
+        return util.pytorch_cos_sim(embs, embs).cpu().numpy().astype(np.float32)
+
     # 🚀 BATCH METHOD: Filter Skills
     def batch_filter_skills(self, candidates: List[str], threshold: float = 0.35) -> List[str]:
         """
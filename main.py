@@ -22,7 +22,8 @@ from config import (
     JOB_SEARCH_KEYWORDS,
     JOB_SEARCH_LOCATION,
     TOTAL_MAX_JOBS,
-    OUTPUT_DIR
+    OUTPUT_DIR,
+    REGENERATE_LETTERS
 )
 from utils.logger import logger
 from core.resume_parser import ResumeParser
@@ -115,22 +116,30 @@ def main():
         logger.info("="*80)
         
         matcher = IntelligentJobMatcher()
-        match_results = []
         
-        for idx, job in enumerate(jobs, 1):
-            try:
-                match_result = matcher.match_with_intelligent_insights(
-                    resume_profile=resume_profile,
-                    job=job
-                )
-                match_results.append(match_result)
-                
-                if idx % 5 == 0 or idx == len(jobs):
-                    logger.info(f"  Progress: {idx}/{len(jobs)} jobs analyzed...")
+        # Same vectorized path as the web app, so CLI and UI scores never drift apart
+        try:
+            match_results = matcher.batch_match(resume_profile, jobs)
+            logger.info(f"  Progress: {len(jobs)}/{len(jobs)} jobs analyzed...")
+        except Exception as e:
+            # One malformed job shouldn't cost every match: score them one at a time
+            logger.warning(f"  Batch matching failed ({e}); falling back to per-job matching")
+            match_results = []
             
-            except Exception as e:
-                logger.error(f"  Error matching job {idx}: {e}")
-                continue
+            for idx, job in enumerate(jobs, 1):
+                try:
+                    match_result = matcher.match_with_intelligent_insights(
+                        resume_profile=resume_profile,
+                        job=job
+                    )
+                    match_results.append(match_result)
+                    
+                    if idx % 5 == 0 or idx == len(jobs):
+                        logger.info(f"  Progress: {idx}/{len(jobs)} jobs analyzed...")
+                
+                except Exception as e:
+                    logger.error(f"  Error matching job {idx}: {e}")
+                    continue
         
         # Sort by match score
         match_results.sort(key=lambda x: x['overall_score'], reverse=True)
@@ -200,10 +209,13 @@ def main():
         # Only generate for matches that are at least "Fair" (> 40%)
         viable_matches = [m for m in match_results if m['overall_score'] > 0.4][:3]
         
-        for i, match in enumerate(viable_matches):
+        # Pass the FULL resume profile so we can get contact info; letters are drafted concurrently
+        letters = writer.generate_batch(resume_profile, viable_matches, regenerate=REGENERATE_LETTERS)
+        
+        for i, (match, letter) in enumerate(zip(viable_matches, letters)):
             try:
-                # Pass the FULL resume profile so we can get contact info
-                letter = writer.generate_cover_letter(resume_profile, match)
+                if isinstance(letter, Exception):
+                    raise letter
                 
                 company_safe = "".join(c for c in match['company'] if c.isalnum()).strip()
                 filename = f"COVER_LETTER_{i+1}_{company_safe}.txt"
@@ -0,0 +1,135 @@
+"""
+Result Cache
+Content-hash keyed memoization for expensive pipeline steps, with an
+in-process LRU layer and an optional on-disk layer (diskcache).
+"""
+
+import copy
+import functools
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+from config import CACHE_DIR
+from utils.logger import logger
+
+try:
+    from diskcache import Cache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+# orjson serializes key material several times faster than stdlib json
+try:
+    import orjson
+
+    def _dump_key(parts: Any) -> bytes:
+        return orjson.dumps(parts, default=str,
+                            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def _dump_key(parts: Any) -> bytes:
+        return json.dumps(parts, sort_keys=True, default=str).encode('utf-8')
+
+# Keys only need to be unique, not cryptographic: prefer xxh3, else non-security blake2b
+try:
+    import xxhash
+
+    def _fast_hash(data: bytes) -> str:
+        return xxhash.xxh3_128_hexdigest(data)
+except ImportError:
+    def _fast_hash(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=16, usedforsecurity=False).hexdigest()
+
+
+_MISSING = object()  # Memory-layer miss marker, so a cached None still counts as a hit
+
+
+def open_disk_cache(namespace: str):
+    """diskcache.Cache under .cache/<namespace>, or None when diskcache is unavailable."""
+    if not DISKCACHE_AVAILABLE:
+        return None
+    try:
+        return Cache(str(CACHE_DIR / namespace))
+    except Exception as e:
+        logger.warning(f"Disk cache unavailable for {namespace}: {e}")
+        return None
+
+
+def make_key(*parts: Any) -> str:
+    """Stable hash of arbitrary JSON-able inputs (dict key order does not matter)."""
+    return _fast_hash(_dump_key(parts))
+
+
+def cached_method(namespace: str, version: str = "1", expire: Optional[int] = None,
+                  maxsize: int = 128, key_extra: Optional[Callable] = None) -> Callable:
+    """
+    Memoize an instance method on its arguments (``self`` is ignored).
+
+    Args:
+        namespace: Sub-directory of .cache/ used for the disk layer
+        version: Bump to invalidate old entries when the output format changes
+        expire: Seconds before an entry goes stale (None = never)
+        maxsize: Number of entries kept in the in-process LRU
+        key_extra: Optional ``f(self)`` adding instance state to the key
+    """
+    def decorator(func: Callable) -> Callable:
+        memory = OrderedDict()
+        lock = threading.Lock()  # Shared by Streamlit sessions and worker threads
+        disk = open_disk_cache(namespace)
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            extra = key_extra(self) if key_extra else None
+            key = make_key(version, extra, args, kwargs)
+
+            # Entries without an expiry can live in-process; TTL'd ones go to disk only
+            if expire is None:
+                with lock:
+                    hit = memory.get(key, _MISSING)
+                    if hit is not _MISSING:
+                        memory.move_to_end(key)
+                if hit is not _MISSING:
+                    return copy.deepcopy(hit)
+
+            if disk is not None:
+                hit = disk.get(key)
+                if hit is not None:
+                    return hit
+
+            result = func(self, *args, **kwargs)
+
+            if disk is not None:
+                disk.set(key, result, expire=expire)
+            if expire is None:
+                stored = copy.deepcopy(result)
+                with lock:
+                    memory[key] = stored
+                    if len(memory) > maxsize:
+                        memory.popitem(last=False)
+            return result
+
+        def cache_clear():
+            with lock:
+                memory.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+
+def cached_function(namespace: str, version: str = "1", expire: Optional[int] = None,
+                    maxsize: int = 128) -> Callable:
+    """Same as ``cached_method``, for plain functions and closures."""
+    def decorator(func: Callable) -> Callable:
+        method = cached_method(namespace, version, expire, maxsize)(
+            lambda _self, *args, **kwargs: func(*args, **kwargs)
+        )
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return method(None, *args, **kwargs)
+
+        wrapper.cache_clear = method.cache_clear
+        return wrapper
+    return decorator
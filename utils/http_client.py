@@ -0,0 +1,25 @@
+"""
+Shared HTTP Client
+One keep-alive httpx client reused by every Groq / LangChain caller, so TLS
+handshakes to the API are paid once per process instead of once per client.
+"""
+
+import functools
+import httpx
+
+# HTTP/2 needs the optional 'h2' package (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+@functools.lru_cache(maxsize=None)
+def get_http_client() -> httpx.Client:
+    """Process-wide client; httpx.Client is thread-safe and pools connections."""
+    return httpx.Client(
+        http2=HTTP2_AVAILABLE,
+        timeout=httpx.Timeout(60.0, connect=10.0),
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+    )
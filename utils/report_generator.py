@@ -10,6 +10,17 @@ from datetime import datetime
 from typing import Dict, List
 from utils.logger import logger
 
+# orjson writes the analysis dump several times faster; stdlib json is the fallback
+try:
+    import orjson
+
+    def _dump_json(data) -> bytes:
+        return orjson.dumps(data, default=str,
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    def _dump_json(data) -> bytes:
+        return json.dumps(data, indent=2, default=str).encode('utf-8')
+
 class ReportGenerator:
     def __init__(self, output_dir: Path):
         self.output_dir = Path(output_dir)
@@ -139,6 +150,5 @@ class ReportGenerator:
             'gaps': gaps
         }
         path = self.output_dir / f"FULL_ANALYSIS_{self.timestamp}.json"
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, default=str)
+        path.write_bytes(_dump_json(data))
         return path
\ No newline at end of file
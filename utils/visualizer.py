@@ -3,18 +3,30 @@ Report Visualizer
 Generates radar charts and word clouds for the analysis.
 """
 
-import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.figure import Figure
 from wordcloud import WordCloud
+from io import BytesIO
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Union
 from utils.logger import logger
 
 class ReportVisualizer:
     def __init__(self, output_dir: Path):
         self.output_dir = output_dir
 
-    def generate_skill_radar(self, skill_categories: Dict) -> Path:
+    def _save(self, fig: Figure, filename: str, buf: Optional[BytesIO]) -> Union[Path, BytesIO]:
+        """Writes the PNG into `buf` when given, otherwise into output_dir."""
+        if buf is not None:
+            fig.savefig(buf, format="png")
+            buf.seek(0)
+            return buf
+        
+        filepath = self.output_dir / filename
+        fig.savefig(filepath)
+        return filepath
+
+    def generate_skill_radar(self, skill_categories: Dict, buf: BytesIO = None) -> Union[Path, BytesIO]:
         """Creates a Radar/Spider chart of skill distribution."""
         logger.info("  📊 Generating Skill Radar Chart...")
         
@@ -27,19 +39,17 @@ class ReportVisualizer:
         
         label_loc = np.linspace(start=0, stop=2 * np.pi, num=len(counts))
 
-        plt.figure(figsize=(8, 8))
-        plt.subplot(polar=True)
-        plt.plot(label_loc, counts, label='Skill Count')
-        plt.fill(label_loc, counts, alpha=0.25)
-        plt.title('Skill Distribution by Category', size=20, y=1.05)
-        plt.lines, plt.labels = plt.thetagrids(np.degrees(label_loc), labels=categories)
-        
-        filepath = self.output_dir / "visual_skill_radar.png"
-        plt.savefig(filepath)
-        plt.close()
-        return filepath
+        # Figure API (not pyplot) keeps charts thread-safe when rendered concurrently
+        fig = Figure(figsize=(8, 8))
+        ax = fig.add_subplot(polar=True)
+        ax.plot(label_loc, counts, label='Skill Count')
+        ax.fill(label_loc, counts, alpha=0.25)
+        ax.set_title('Skill Distribution by Category', size=20, y=1.05)
+        ax.set_thetagrids(np.degrees(label_loc), labels=categories)
+        
+        return self._save(fig, "visual_skill_radar.png", buf)
 
-    def generate_market_wordcloud(self, jobs: List[Dict]) -> Path:
+    def generate_market_wordcloud(self, jobs: List[Dict], buf: BytesIO = None) -> Union[Path, BytesIO]:
         """Creates a Word Cloud from all job descriptions."""
         logger.info("  ☁️ Generating Market Keyword Cloud...")
         
@@ -47,12 +57,10 @@ class ReportVisualizer:
         
         wc = WordCloud(width=800, height=400, background_color='white', max_words=100).generate(text)
         
-        plt.figure(figsize=(10, 5))
-        plt.imshow(wc, interpolation='bilinear')
-        plt.axis('off')
-        plt.title('Top Market Keywords', size=15)
+        fig = Figure(figsize=(10, 5))
+        ax = fig.add_subplot()
+        ax.imshow(wc, interpolation='bilinear')
+        ax.axis('off')
+        ax.set_title('Top Market Keywords', size=15)
         
-        filepath = self.output_dir / "visual_market_wordcloud.png"
-        plt.savefig(filepath)
-        plt.close()
-        return filepath
\ No newline at end of file
+        return self._save(fig, "visual_market_wordcloud.png", buf)
\ No newline at end of file